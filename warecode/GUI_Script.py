@@ -1,24 +1,45 @@
-import sys
+import sys, argparse
+from core.startup import startup_timer
 from PyQt5.QtWidgets import QApplication
-from ui.login_window import LoginWindow
-from ui.main_window import RobotMonitorApp
 from core.session import load_session
 
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Robot Monitoring System")
+    parser.add_argument("--server", metavar="HOST:PORT",
+                        help="attach to a shared monitor_daemon.py --serve instead of polling the ESS")
+    args, _ = parser.parse_known_args(argv)
+    return args
+
+def show_main(session, server=None):
+    # Imported here so the login screen doesn't pay for the main window's modules
+    from ui.main_window import RobotMonitorApp
+    startup_timer.mark("import main window")
+    window = RobotMonitorApp(session, server=server)
+    window.show()
+    return window
+
 def main():
     app = QApplication(sys.argv)
+    startup_timer.mark("qt init")
+
+    args = parse_args(sys.argv[1:])
+    server = None
+    if args.server:
+        from core.fanout import parse_address
+        server = parse_address(args.server)
 
     # Callback after login succeeds
     def launch_main(session):
-        window = RobotMonitorApp(session)
-        window.show()
+        launch_main.window = show_main(session, server)
         login.close()
 
     # If a session file already exists, load it and go straight to main
     saved = load_session()
+    startup_timer.mark("load session")
     if saved:
-        window = RobotMonitorApp(saved)
-        window.show()
+        window = show_main(saved, server)
     else:
+        from ui.login_window import LoginWindow
         login = LoginWindow(on_login=launch_main)
         login.show()
 
@@ -1,34 +1,163 @@
 import json
 import os
+import threading
+from bisect import bisect_right
 
 BLACKLIST_FILE = os.path.join(os.path.dirname(__file__), "..", "resources", "blacklist.json")
 
-def load_blacklist():
+def _read_ranges(path):
+    with open(path, "r") as f:
+        data = json.load(f)
+        return data.get("ranges", [])
+
+def load_blacklist(path=BLACKLIST_FILE):
     try:
-        with open(BLACKLIST_FILE, "r") as f:
-            data = json.load(f)
-            return data.get("ranges", [])
+        return _read_ranges(path)
     except Exception as e:
         print(f"⚠️ Could not load blacklist: {e}")
         return []
 
-def save_blacklist(ranges):
+def save_blacklist(ranges, path=BLACKLIST_FILE):
     try:
-        with open(BLACKLIST_FILE, "w") as f:
+        # Write to a temp file and swap it in so a watcher never reads a half-written file
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
             json.dump({"ranges": ranges}, f, indent=2)
+        os.replace(tmp_path, path)
+        return True
     except Exception as e:
         print(f"⚠️ Could not save blacklist: {e}")
+        return False
 
-def is_blacklisted(robot_code, blacklist_ranges):
+def parse_robot_number(robot_code):
     try:
-        num = int(robot_code.split("-")[1])
-    except (IndexError, ValueError):
-        return False
+        return int(robot_code.split("-")[1])
+    except (IndexError, ValueError, AttributeError):
+        return None
+
+class CompiledBlacklist:
+    def __init__(self, ranges):
+        self.ranges = [tuple(r) for r in ranges]
+        self._starts, self._ends = self._compile(self.ranges)
+        self._ids = {}  # robot code -> parsed number (or None)
+
+    @staticmethod
+    def _compile(ranges):
+        intervals = []
+        for start, end in ranges:
+            if start is None:
+                raise ValueError(f"range [{start}, {end}] has no start")
+            start = int(start)
+            end = float("inf") if end is None else int(end)
+            if end < start:
+                start, end = end, start
+            intervals.append((start, end))
+        intervals.sort()
+
+        merged = []
+        for start, end in intervals:
+            # Robot ids are integers, so touching ranges ([31, 35], [36, 40]) merge too
+            if merged and start <= merged[-1][1] + 1:
+                if end > merged[-1][1]:
+                    merged[-1][1] = end
+            else:
+                merged.append([start, end])
+        return [s for s, _ in merged], [e for _, e in merged]
+
+    def robot_number(self, robot_code):
+        try:
+            return self._ids[robot_code]
+        except KeyError:
+            num = self._ids[robot_code] = parse_robot_number(robot_code)
+            return num
+
+    def contains_number(self, num):
+        i = bisect_right(self._starts, num) - 1
+        return i >= 0 and num <= self._ends[i]
+
+    def __contains__(self, robot_code):
+        num = self.robot_number(robot_code)
+        return num is not None and self.contains_number(num)
+
+    def classify(self, robots, key="code"):
+        # Splits one poll's robot list into (allowed, blacklisted)
+        allowed, blocked = [], []
+        for robot in robots:
+            (blocked if robot.get(key, "") in self else allowed).append(robot)
+        return allowed, blocked
+
+    def intervals(self):
+        return [(s, None if e == float("inf") else e) for s, e in zip(self._starts, self._ends)]
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+class BlacklistStore:
+    def __init__(self, path=BLACKLIST_FILE, check_interval=2.0):
+        self.path = path
+        self.check_interval = check_interval
+        self.version = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._watcher = None
+        self._mtime = _mtime(path)
+        # Readers only ever grab this reference; it is replaced, never mutated
+        try:
+            self.snapshot = CompiledBlacklist(load_blacklist(path))
+        except Exception as e:
+            print(f"⚠️ Invalid blacklist ranges, starting with an empty blacklist: {e}")
+            self.snapshot = CompiledBlacklist([])
+
+    def _swap(self, compiled, mtime):
+        with self._lock:
+            self.snapshot = compiled
+            self._mtime = mtime
+            self.version += 1
+        return compiled
+
+    def replace(self, ranges):
+        saved = save_blacklist(ranges, self.path)
+        return self._swap(CompiledBlacklist(ranges), _mtime(self.path) if saved else self._mtime)
+
+    def check_for_changes(self):
+        mtime = _mtime(self.path)
+        if mtime is None or mtime == self._mtime:
+            return False
+        try:
+            compiled = CompiledBlacklist(_read_ranges(self.path))
+        except Exception as e:
+            # Keep the last good snapshot rather than dropping the whole blacklist (or the watcher thread)
+            print(f"⚠️ Ignoring unreadable blacklist update: {e}")
+            self._mtime = mtime
+            return False
+        self._swap(compiled, mtime)
+        print(f"🔄 Blacklist reloaded (version {self.version})")
+        return True
+
+    def _watch(self):
+        while not self._stop.wait(self.check_interval):
+            self.check_for_changes()
+
+    def start(self):
+        if self._watcher is None or not self._watcher.is_alive():
+            self._stop.clear()
+            self._watcher = threading.Thread(target=self._watch, name="blacklist-watcher", daemon=True)
+            self._watcher.start()
+
+    def stop(self):
+        self._stop.set()
+
+_shared_store = None
+_shared_lock = threading.Lock()
 
-    for start, end in blacklist_ranges:
-        if end is None:
-            if num >= start:
-                return True
-        elif start <= num <= end:
-            return True
-    return False
\ No newline at end of file
+def get_blacklist_store():
+    global _shared_store
+    with _shared_lock:
+        if _shared_store is None:
+            _shared_store = BlacklistStore()
+            _shared_store.start()
+        return _shared_store
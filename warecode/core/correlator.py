@@ -0,0 +1,70 @@
+import json
+from collections import deque
+from .error_signature import catalog
+
+FLEET_PREFIX = "fleet:"
+
+class FleetIncident:
+    __slots__ = ("key", "fleet_id", "robots", "opened_at")
+
+    def __init__(self, key, robots, opened_at):
+        self.key = key
+        self.fleet_id = FLEET_PREFIX + key
+        self.robots = robots          # every robot seen with this signature while open
+        self.opened_at = opened_at
+
+    def describe(self):
+        desc = catalog.descriptions.get(self.key)
+        return json.dumps({"sig": self.key, "info": desc["info"] if desc else self.key,
+                           "robots": sorted(self.robots)}, separators=(",", ":"), ensure_ascii=False)
+
+class IncidentCorrelator:
+    # Groups new incidents that share an error signature inside a
+    # sliding window. The window is a deque of (time, key, robot) plus per-key robot counts, so each
+    # observation and each expiry is O(1); nothing rescans the window.
+    def __init__(self, window=300.0, min_robots=3):
+        self.window = window
+        self.min_robots = min_robots
+        self._events = deque()
+        self._robots = {}     # key -> {robot: occurrences in window}
+        self.active = {}      # key -> FleetIncident
+
+    def observe(self, incidents, now):
+        # incidents: [(robot code, key)] opened this tick. Returns (opened, closed) FleetIncidents.
+        for robot, key in incidents:
+            self._events.append((now, key, robot))
+            robots = self._robots.setdefault(key, {})
+            robots[robot] = robots.get(robot, 0) + 1
+            incident = self.active.get(key)
+            if incident is not None:
+                incident.robots.add(robot)
+
+        closed = []
+        horizon = now - self.window
+        events = self._events
+        while events and events[0][0] < horizon:
+            _, key, robot = events.popleft()
+            robots = self._robots[key]
+            if robots[robot] > 1:
+                robots[robot] -= 1
+                continue
+            del robots[robot]
+            if not robots:
+                del self._robots[key]
+                incident = self.active.pop(key, None)
+                if incident is not None:
+                    closed.append(incident)
+
+        opened = []
+        for _, key in incidents:
+            robots = self._robots.get(key)
+            if key not in self.active and robots is not None and len(robots) >= self.min_robots:
+                incident = self.active[key] = FleetIncident(key, set(robots), now)
+                opened.append(incident)
+        return opened, closed
+
+def incident_keys(robot, rule):
+    # Only device faults correlate, per error signature; a few robots on low battery or stuck at once is normal
+    if rule.detail == "$errors":
+        return robot.error_sigs
+    return ()
@@ -0,0 +1,168 @@
+import queue, time
+from .blacklist import get_blacklist_store
+from .http_client import get_client
+from .ess_poller import MultiEssPoller
+from .scheduler import PollScheduler
+from .robot_state import RobotStateStore
+from .snapshot import RobotSnapshot, FleetSnapshot
+from .history import get_history_store
+from .rules import get_rule_engine
+from .events import ExceptionEvent
+from .telemetry import get_telemetry_store
+from .spatial import SpatialIndex
+from .correlator import IncidentCorrelator, incident_keys
+
+LATENCY_REPORT_EVERY = 300
+FLEET_TYPE = "Fleet"
+FLEET_CATEGORY = "Fleet Exception"
+
+class MonitorEngine:
+    # Polling, classification and exception lifecycle with no Qt dependency.
+    # Results go to the on_delta/on_exceptions callbacks (called on the polling thread).
+    def __init__(self, client=None, blacklist_store=None, history=None, endpoints=None, rules=None,
+                 telemetry=None, spatial=None, correlator=None, on_delta=None, on_exceptions=None):
+        self.running = True
+        self.client = client or get_client()
+        self.poller = MultiEssPoller(endpoints, client=self.client)
+        self.scheduler = PollScheduler()
+        self._latency_reported = 0
+        self.error_logs = {}
+        self.handled_robots = set()
+        self._handled_requests = queue.SimpleQueue()
+        self.blacklist_store = blacklist_store or get_blacklist_store()
+        self.state_store = RobotStateStore()
+        self.history = history or get_history_store()
+        self.rules = rules or get_rule_engine()
+        self.telemetry = telemetry if telemetry is not None else get_telemetry_store()
+        self.spatial = spatial or SpatialIndex()
+        self.correlator = correlator or IncidentCorrelator()
+        self._correlating = False  # faults already present at startup aren't a burst of new ones
+        self.on_delta = on_delta
+        self.on_exceptions = on_exceptions
+
+    def mark_robot_handled(self, robot_name, time_of_exception):
+        # May be called from any thread; applied at the start of the next poll
+        self._handled_requests.put((robot_name, time_of_exception))
+
+    def _apply_handled(self):
+        while True:
+            try:
+                robot_name, time_of_exception = self._handled_requests.get_nowait()
+            except queue.Empty:
+                return
+            if self.error_logs.get(robot_name) != time_of_exception:
+                continue  # an earlier, already resolved incident; leave the robot's current one open
+            self.handled_robots.add(robot_name)
+            del self.error_logs[robot_name]
+
+    def run(self):
+        while self.running:
+            try:
+                ok, urgent = self.poll_once()
+            except Exception as e:
+                ok, urgent = False, False
+                print(f"🚨 Error: {str(e)}")
+            self.scheduler.tick_done(ok=ok, urgent=urgent)
+            if not self.scheduler.wait():
+                break
+
+    def poll_once(self):
+        self._apply_handled()
+        poll = self.poller.poll_sync()
+        if self.client.request_count - self._latency_reported >= LATENCY_REPORT_EVERY:
+            self._latency_reported = self.client.request_count
+            stats = self.client.stats()
+            print(f"📶 ESS latency: avg {stats['avg_ms']:.0f} ms, max {stats['max_ms']:.0f} ms, "
+                  f"{stats['errors']}/{stats['requests']} failed")
+        if not poll.ok:
+            return False, False
+
+        blacklist = self.blacklist_store.snapshot
+        robots, _ = blacklist.classify(poll.robots)    ## IMPORTANT
+        now = time.time()
+        self.spatial.update(robots, now)
+        fleet = FleetSnapshot([RobotSnapshot.from_record(robot) for robot in robots], now)
+        if self.telemetry is not None:
+            self.telemetry.append([robot for robot in robots if not robot.get("stale")], fleet.taken_at)
+        urgent = False
+        new_exceptions, resolutions, events, correlated = [], [], [], []
+        evaluate = self.rules.evaluate
+        for robot in fleet:
+            if robot.stale:
+                continue  # last known state of a failed ESS: neither open nor resolve anything on it
+            name = robot.code
+            rule = evaluate(robot)
+
+            if rule is None:
+                self.handled_robots.discard(name)
+                # Resolution
+                if name in self.error_logs:
+                    handled_time = time.strftime("%Y-%m-%d %H:%M:%S")
+                    events.append(ExceptionEvent(name, robot.display_type, "Resolved", self.error_logs[name],
+                                                 handled_time, "Resolved"))
+                    resolutions.append((handled_time, name, self.error_logs[name]))
+                    del self.error_logs[name]
+                continue
+
+            if name in self.handled_robots:
+                continue  # Skip robots that user handled manually
+
+            urgent = urgent or rule.urgent
+            if name not in self.error_logs:
+                detail = rule.describe(robot)
+                start_time = time.strftime("%Y-%m-%d %H:%M:%S")
+                self.error_logs[name] = start_time
+                events.append(ExceptionEvent(name, robot.display_type, detail, start_time, "N/A", rule.category))
+                new_exceptions.append((name, robot.display_type, rule.category, detail, start_time))
+                if self._correlating:
+                    correlated.extend((name, key) for key in incident_keys(robot, rule))
+        self._correlating = True
+        self.correlate(correlated, new_exceptions, resolutions, events)
+        self.save_history(new_exceptions, resolutions)
+        if events and self.on_exceptions is not None:
+            self.on_exceptions(events)
+
+        delta = self.state_store.update(fleet)
+        if delta and self.on_delta is not None:
+            self.on_delta(delta)
+        return True, urgent
+
+    def correlate(self, correlated, new_exceptions, resolutions, events):
+        # Fleet-level incidents follow the same lifecycle as robot ones, keyed by their fleet id
+        opened, closed = self.correlator.observe(correlated, time.monotonic())
+        now = time.strftime("%Y-%m-%d %H:%M:%S")
+        for incident in closed:
+            name = incident.fleet_id
+            self.handled_robots.discard(name)
+            if name in self.error_logs:
+                events.append(ExceptionEvent(name, FLEET_TYPE, "Resolved", self.error_logs[name], now, "Resolved"))
+                resolutions.append((now, name, self.error_logs.pop(name)))
+        for incident in opened:
+            name = incident.fleet_id
+            detail = incident.describe()
+            self.error_logs[name] = now
+            events.append(ExceptionEvent(name, FLEET_TYPE, detail, now, "N/A", FLEET_CATEGORY))
+            new_exceptions.append((name, FLEET_TYPE, FLEET_CATEGORY, detail, now))
+
+    def save_history(self, new_exceptions, resolutions):
+        try:
+            self.history.record_exceptions(new_exceptions)
+            self.history.record_resolutions(resolutions)
+        except Exception as e:
+            print(f"⚠️ Could not write exception history: {e}")
+
+    def stop(self):
+        # Wakes the scheduler wait immediately; run() returns after the current poll
+        self.running = False
+        self.scheduler.stop()
+
+    def close(self):
+        self.poller.close()
+
+class QueueSink:
+    # Plain queue interface for consumers that prefer pulling over callbacks
+    def __init__(self, maxsize=0):
+        self.queue = queue.Queue(maxsize)
+
+    def __call__(self, item):
+        self.queue.put(item)
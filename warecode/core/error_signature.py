@@ -0,0 +1,58 @@
+import hashlib, json, re, sys, threading
+
+# MonitorHealth infos embed the fault time, e.g. "fault state(time=2025-02-22 20:52:48.541998 info=...)",
+# which makes otherwise identical errors look different on every report.
+_VOLATILE_TIME = re.compile(r"time=\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}(?:\.\d+)?\s*")
+
+def normalise_info(info):
+    return _VOLATILE_TIME.sub("", info or "").strip()
+
+class ErrorCatalog:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._by_key = {}        # (type, code, node, normalised info) -> signature
+        self.descriptions = {}   # signature -> {"type", "code", "node", "info"}
+
+    def signature(self, entry):
+        # Keyed on the normalised info: raw infos embed a fresh timestamp on nearly every report,
+        # so a raw-keyed cache would grow without bound in a long-running monitor
+        key = (entry.get("type", ""), entry.get("code", ""), entry.get("node", ""),
+               normalise_info(entry.get("info", "")))
+        sig = self._by_key.get(key)
+        if sig is not None:
+            return sig
+
+        err_type, code, node, info = (sys.intern(str(v)) for v in key)
+        digest = hashlib.sha1(f"{err_type}|{code}|{node}|{info}".encode("utf-8")).hexdigest()[:12]
+        sig = sys.intern(digest)
+        with self._lock:
+            self.descriptions.setdefault(sig, {"type": err_type, "code": code, "node": node, "info": info})
+            self._by_key[key] = sig
+        return sig
+
+    def summarise(self, error_state):
+        # Collapse repeated entries into (signature, count), keeping first-seen order
+        counts = {}
+        for entry in error_state or []:
+            sig = self.signature(entry)
+            counts[sig] = counts.get(sig, 0) + 1
+        return list(counts.items())
+
+    def signatures(self, error_state):
+        return tuple(sorted({self.signature(entry) for entry in error_state or []}))
+
+    def to_json(self, error_state):
+        entries = []
+        for sig, count in self.summarise(error_state):
+            desc = self.descriptions[sig]
+            entries.append({"sig": sig, "type": desc["type"], "code": desc["code"], "node": desc["node"],
+                            "info": desc["info"], "count": count})
+        return json.dumps(entries, separators=(",", ":"), ensure_ascii=False)
+
+catalog = ErrorCatalog()
+
+def summarise_errors(error_state):
+    return catalog.to_json(error_state)
+
+def error_signatures(error_state):
+    return catalog.signatures(error_state)
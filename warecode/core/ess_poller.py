@@ -0,0 +1,149 @@
+import asyncio, json, os, time
+from concurrent.futures import ThreadPoolExecutor
+from .http_client import get_client
+from .ess_parser import DEFAULT_PROJECTION, read_robots
+
+ENDPOINTS_FILE = os.path.join(os.path.dirname(__file__), "..", "resources", "endpoints.json")
+QUERY_PATH = 'ess-api/model/queryModelByType?modelType=robot'
+DEFAULT_ENDPOINTS = [{"name": "ESS", "url": "http://10.251.3.24:9000/", "min_interval": 0}]
+STALE_TIMEOUT = 60.0
+ROUND_TIMEOUT = 1.5          # a round stops waiting for a slow ESS after this; its robots go stale
+ENDPOINT_BACKOFF = 1.0
+MAX_ENDPOINT_BACKOFF = 30.0
+
+def load_endpoints(path=ENDPOINTS_FILE):
+    try:
+        with open(path, "r") as f:
+            data = json.load(f)
+            return data.get("endpoints", []) or DEFAULT_ENDPOINTS
+    except FileNotFoundError:
+        return DEFAULT_ENDPOINTS
+    except Exception as e:
+        print(f"⚠️ Could not load ESS endpoints: {e}")
+        return DEFAULT_ENDPOINTS
+
+class EssEndpoint:
+    def __init__(self, name, url, min_interval=0):
+        self.name = name
+        self.query_url = url.rstrip("/") + "/" + QUERY_PATH
+        self.min_interval = min_interval
+        self.last_polled = None
+        self.last_ok = None
+        self.last_robots = []
+        self.last_error = None
+        self.failures = 0
+        self.next_due = 0.0
+        self.task = None  # request still in flight, possibly started in an earlier round
+
+    def due(self, now):
+        return self.task is None and now >= self.next_due
+
+    def succeeded(self, robots):
+        self.last_robots = robots
+        self.last_ok = self.last_polled
+        self.last_error = None
+        self.failures = 0
+        self.next_due = self.last_polled + self.min_interval
+
+    def failed(self, error, now):
+        # Each ESS backs off on its own, so one that is down doesn't slow the others' rounds
+        self.last_error = error
+        self.failures += 1
+        self.next_due = now + min(ENDPOINT_BACKOFF * 2 ** self.failures, MAX_ENDPOINT_BACKOFF)
+
+class PollResult:
+    __slots__ = ("robots", "failed", "ok", "stale")
+
+    def __init__(self, robots, failed, ok, stale=()):
+        self.robots = robots   # merged fleet, each robot tagged with "source" (and "stale" if carried over)
+        self.failed = failed   # names of endpoints that errored this round
+        self.ok = ok           # at least one endpoint answered
+        self.stale = stale     # failed endpoints whose last good robots are still in the fleet
+
+class MultiEssPoller:
+    def __init__(self, endpoints=None, client=None, projection=DEFAULT_PROJECTION, stale_timeout=STALE_TIMEOUT,
+                 round_timeout=ROUND_TIMEOUT):
+        configs = endpoints if endpoints is not None else load_endpoints()
+        self.endpoints = [e if isinstance(e, EssEndpoint) else EssEndpoint(**e) for e in configs]
+        self.client = client or get_client()
+        self.projection = projection
+        self.stale_timeout = stale_timeout
+        self.round_timeout = round_timeout
+        # requests is blocking, so each endpoint gets a worker; the event loop only coordinates
+        self._executor = ThreadPoolExecutor(max_workers=max(1, len(self.endpoints)),
+                                            thread_name_prefix="ess-poll")
+        self._loop = None
+
+    def _get_robots(self, endpoint):
+        # Not streamed, so the client's latency stats cover the whole body download
+        response = self.client.get(endpoint.query_url)
+        if response.status_code != 200:
+            raise RuntimeError(f"HTTP {response.status_code}")
+        return read_robots(response, self.projection)
+
+    async def _poll_endpoint(self, endpoint):
+        loop = asyncio.get_running_loop()
+        try:
+            robots = await loop.run_in_executor(self._executor, self._get_robots, endpoint)
+        except Exception as e:
+            endpoint.failed(str(e), time.monotonic())
+            print(f"🚨 {endpoint.name}: {endpoint.last_error}")
+            return
+        finally:
+            endpoint.task = None
+        for robot in robots:
+            robot["source"] = endpoint.name
+        endpoint.succeeded(robots)
+
+    async def poll(self):
+        now = time.monotonic()
+        for endpoint in self.endpoints:
+            # Endpoints that aren't due (rate-limited or backing off) reuse their last answer
+            if endpoint.due(now):
+                endpoint.last_polled = now
+                endpoint.task = asyncio.ensure_future(self._poll_endpoint(endpoint))
+        pending = [endpoint.task for endpoint in self.endpoints if endpoint.task is not None]
+        if pending:
+            # A hung ESS keeps its request running into later rounds rather than holding this one up
+            await asyncio.wait(pending, timeout=self.round_timeout)
+
+        fresh, failed, stale = [], [], []
+        for endpoint in self.endpoints:
+            if endpoint.task is None and endpoint.last_error is None and endpoint.last_ok is not None:
+                fresh.append(endpoint)
+                continue
+            failed.append(endpoint.name)
+            # One ESS blipping shouldn't make its robots vanish and reappear downstream;
+            # keep its last good answer, marked stale, until the timeout
+            if endpoint.last_ok is not None and now - endpoint.last_ok <= self.stale_timeout:
+                stale.append(endpoint)
+                for robot in endpoint.last_robots:
+                    robot["stale"] = True
+
+        merged, seen = [], set()
+        for endpoint in fresh + stale:  # a live answer wins over a stale one for the same robot
+            for robot in endpoint.last_robots:
+                code = robot.get("code")
+                if code in seen:
+                    continue
+                seen.add(code)
+                merged.append(robot)
+        return PollResult(merged, failed, len(failed) < len(self.endpoints),
+                          [endpoint.name for endpoint in stale])
+
+    def poll_sync(self):
+        # The calling thread owns a long-lived event loop rather than creating one per tick
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+        return self._loop.run_until_complete(self.poll())
+
+    def close(self):
+        if self._loop is not None:
+            pending = [endpoint.task for endpoint in self.endpoints if endpoint.task is not None]
+            for task in pending:
+                task.cancel()
+            if pending:
+                self._loop.run_until_complete(asyncio.wait(pending))
+            self._loop.close()
+            self._loop = None
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,5 @@
+from collections import namedtuple
+
+# One exception transition (new incident or resolution), same fields the GUI table shows
+ExceptionEvent = namedtuple(
+    "ExceptionEvent", ["robot_id", "robot_type", "error", "time_of_exception", "time_handled", "category"])
@@ -0,0 +1,263 @@
+import json, queue, socket, socketserver, threading, time
+from .events import ExceptionEvent
+from .robot_state import StateDelta
+from .snapshot import RobotSnapshot, FleetSnapshot
+
+# Newline-delimited JSON over TCP.
+#   server -> client: {"type": "snapshot", "robots": [...], "exceptions": [...]} once on connect,
+#                     then {"type": "delta", ...} and {"type": "exceptions", "events": [...]};
+#                     an incident handled on one console goes to all as an event with category "Handled"
+#   client -> server: {"type": "handled", "robot_id": "...", "time_of_exception": "..."}
+DEFAULT_PORT = 9555
+CLIENT_QUEUE_SIZE = 256
+
+def encode(message):
+    return (json.dumps(message, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+def parse_address(value, default_host="127.0.0.1"):
+    host, sep, port = value.rpartition(":")
+    if not sep:
+        return default_host, int(value)
+    return host or default_host, int(port)
+
+class _Subscriber:
+    def __init__(self, sock):
+        self.sock = sock
+        self.outbox = queue.Queue(CLIENT_QUEUE_SIZE)
+        self.alive = True
+
+    def send(self, payload):
+        try:
+            self.outbox.put_nowait(payload)
+        except queue.Full:
+            # A console that stops reading must not stall the poller; it can reconnect for a snapshot
+            self.close()
+
+    def close(self):
+        if self.alive:
+            self.alive = False
+            try:
+                self.outbox.put_nowait(None)
+            except queue.Full:
+                pass
+            try:
+                self.sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def write_loop(self):
+        while self.alive:
+            payload = self.outbox.get()
+            if payload is None:
+                break
+            try:
+                self.sock.sendall(payload)
+            except OSError:
+                break
+        self.alive = False
+
+class _TCPServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+class FanoutServer:
+    def __init__(self, engine, host="127.0.0.1", port=DEFAULT_PORT):
+        self.engine = engine
+        self._lock = threading.Lock()
+        self._subscribers = []
+        self._open_events = {}  # (robot id, time of exception) -> ExceptionEvent still open, for snapshots
+        self._fleet = engine.state_store.fleet  # fleet as of the last published delta, for snapshots
+        engine.on_delta = self.publish_delta
+        engine.on_exceptions = self.publish_exceptions
+
+        server = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                server._serve_client(self.request, self.rfile)
+
+        self._tcp = _TCPServer((host, port), Handler)
+        self.address = self._tcp.server_address
+
+    def _serve_client(self, sock, rfile):
+        subscriber = _Subscriber(sock)
+        writer = threading.Thread(target=subscriber.write_loop, name="fanout-writer", daemon=True)
+        with self._lock:
+            # Snapshot and registration happen under the publish lock, and the snapshot is built from what
+            # has been published rather than the engine's live state, so no delta is missed or doubled
+            subscriber.send(encode({
+                "type": "snapshot",
+                "robots": [robot.to_record() for robot in self._fleet],
+                "exceptions": [event._asdict() for event in self._open_events.values()],
+            }))
+            self._subscribers.append(subscriber)
+        writer.start()
+        try:
+            for line in rfile:
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    continue
+                if message.get("type") == "handled" and message.get("robot_id") and message.get("time_of_exception"):
+                    self.handled(message["robot_id"], message["time_of_exception"])
+        except OSError:
+            pass
+        finally:
+            subscriber.close()
+            with self._lock:
+                if subscriber in self._subscribers:
+                    self._subscribers.remove(subscriber)
+
+    def _broadcast(self, payload):
+        dead = []
+        for subscriber in self._subscribers:
+            if subscriber.alive:
+                subscriber.send(payload)
+            else:
+                dead.append(subscriber)
+        for subscriber in dead:
+            self._subscribers.remove(subscriber)
+
+    def handled(self, robot_id, time_of_exception):
+        # Every console drops that incident's row, so two operators don't work the same incident
+        self.engine.mark_robot_handled(robot_id, time_of_exception)
+        with self._lock:
+            event = self._open_events.pop((robot_id, time_of_exception), None)
+            handled = ExceptionEvent(robot_id, event.robot_type if event else "", "Handled", time_of_exception,
+                                     time.strftime("%Y-%m-%d %H:%M:%S"), "Handled")
+            self._broadcast(encode({"type": "exceptions", "events": [handled._asdict()]}))
+
+    def publish_delta(self, delta):
+        payload = encode({
+            "type": "delta",
+            "added": [robot.to_record() for robot in delta.added],
+            "changed": [robot.to_record() for robot in delta.changed],
+            "removed": delta.removed,
+        })
+        with self._lock:
+            self._fleet = delta.fleet
+            self._broadcast(payload)
+
+    def publish_exceptions(self, events):
+        payload = encode({"type": "exceptions", "events": [event._asdict() for event in events]})
+        with self._lock:
+            for event in events:
+                key = (event.robot_id, event.time_of_exception)
+                if event.category == "Resolved":
+                    self._open_events.pop(key, None)
+                else:
+                    self._open_events[key] = event
+            self._broadcast(payload)
+
+    @property
+    def client_count(self):
+        with self._lock:
+            return len(self._subscribers)
+
+    def start(self):
+        thread = threading.Thread(target=self._tcp.serve_forever, name="fanout-server", daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self):
+        self._tcp.shutdown()
+        self._tcp.server_close()
+        with self._lock:
+            for subscriber in self._subscribers:
+                subscriber.close()
+            self._subscribers = []
+
+class FanoutClient:
+    # Subscribes to a FanoutServer and replays its stream as StateDelta / ExceptionEvent callbacks
+    def __init__(self, host, port=DEFAULT_PORT, on_delta=None, on_exceptions=None, retry_interval=2.0):
+        self.host = host
+        self.port = port
+        self.on_delta = on_delta
+        self.on_exceptions = on_exceptions
+        self.retry_interval = retry_interval
+        self.fleet = FleetSnapshot(())
+        self._seen = set()  # (robot id, time of exception) already delivered, to dedupe snapshots on reconnect
+        self._sock = None
+        self._send_lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def mark_robot_handled(self, robot_name, time_of_exception):
+        with self._send_lock:
+            if self._sock is not None:
+                try:
+                    self._sock.sendall(encode({"type": "handled", "robot_id": robot_name,
+                                               "time_of_exception": time_of_exception}))
+                except OSError:
+                    pass
+
+    def run(self):
+        while not self._stop.is_set():
+            try:
+                with socket.create_connection((self.host, self.port), timeout=5) as sock:
+                    sock.settimeout(None)
+                    self._sock = sock
+                    for line in sock.makefile("r", encoding="utf-8"):
+                        self._handle(json.loads(line))
+            except (OSError, ValueError) as e:
+                if not self._stop.is_set():
+                    print(f"🚨 Fan-out server {self.host}:{self.port}: {e}")
+            finally:
+                self._sock = None
+            self._stop.wait(self.retry_interval)
+
+    def _handle(self, message):
+        kind = message.get("type")
+        if kind == "snapshot":
+            robots = [RobotSnapshot.from_record(record) for record in message.get("robots", [])]
+            fleet = FleetSnapshot(robots)
+            known = self.fleet.by_code
+            removed = [code for code in known if code not in fleet.by_code]
+            added = [robot for robot in robots if robot.code not in known]
+            changed = [robot for robot in robots if robot.code in known]
+            self._emit_delta(StateDelta(added, changed, removed, fleet))
+            self._emit_events(message.get("exceptions", []))
+        elif kind == "delta":
+            added = [RobotSnapshot.from_record(record) for record in message.get("added", [])]
+            changed = [RobotSnapshot.from_record(record) for record in message.get("changed", [])]
+            removed = message.get("removed", [])
+            by_code = dict(self.fleet.by_code)
+            for code in removed:
+                by_code.pop(code, None)
+            for robot in added + changed:
+                by_code[robot.code] = robot
+            self._emit_delta(StateDelta(added, changed, removed, FleetSnapshot(by_code.values())))
+        elif kind == "exceptions":
+            self._emit_events(message.get("events", []))
+
+    def _emit_delta(self, delta):
+        self.fleet = delta.fleet
+        if delta and self.on_delta is not None:
+            self.on_delta(delta)
+
+    def _emit_events(self, records):
+        events = []
+        for record in records:
+            event = ExceptionEvent(**record)
+            key = (event.robot_id, event.time_of_exception)
+            if event.category == "Handled":
+                if event.time_of_exception is None:
+                    continue  # names no incident
+                self._seen.discard(key)
+            elif event.category == "Resolved":
+                self._seen.discard(key)
+            elif key in self._seen:
+                continue
+            else:
+                self._seen.add(key)
+            events.append(event)
+        if events and self.on_exceptions is not None:
+            self.on_exceptions(events)
+
+    def stop(self):
+        self._stop.set()
+        sock = self._sock
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
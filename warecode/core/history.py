@@ -0,0 +1,220 @@
+import os, sqlite3, threading, datetime
+
+HISTORY_FILE = os.path.join(os.path.dirname(__file__), "..", "resources", "history.db")
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+COLUMNS = ("id", "robot_id", "robot_type", "category", "error",
+           "time_of_exception", "time_resolved", "time_handled", "employee")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS exceptions (
+    id INTEGER PRIMARY KEY,
+    robot_id TEXT NOT NULL,
+    robot_type TEXT,
+    category TEXT,
+    error TEXT,
+    time_of_exception TEXT NOT NULL,
+    time_resolved TEXT,
+    time_handled TEXT,
+    employee TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_exceptions_robot_time ON exceptions (robot_id, time_of_exception);
+CREATE INDEX IF NOT EXISTS idx_exceptions_time ON exceptions (time_of_exception);
+CREATE INDEX IF NOT EXISTS idx_exceptions_category_time ON exceptions (category, time_of_exception);
+CREATE INDEX IF NOT EXISTS idx_exceptions_handled ON exceptions (time_handled, id);
+CREATE INDEX IF NOT EXISTS idx_exceptions_robot_handled ON exceptions (robot_id, time_handled, id);
+CREATE TABLE IF NOT EXISTS import_state (
+    path TEXT PRIMARY KEY,
+    offset INTEGER NOT NULL,
+    updated TEXT
+);
+"""
+
+def days_ago(days):
+    return (datetime.datetime.now() - datetime.timedelta(days=days)).strftime(TIME_FORMAT)
+
+class HistoryStore:
+    def __init__(self, path=HISTORY_FILE):
+        self.path = path
+        self._local = threading.local()
+        self._connect().executescript(SCHEMA)
+
+    def _connect(self):
+        # sqlite3 connections can't be shared across threads, so each thread gets its own;
+        # WAL lets the GUI read while the monitor thread writes.
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def record_exceptions(self, rows):
+        # rows: (robot_id, robot_type, category, error, time_of_exception)
+        if not rows:
+            return
+        conn = self._connect()
+        with conn:
+            conn.executemany(
+                "INSERT INTO exceptions (robot_id, robot_type, category, error, time_of_exception) "
+                "VALUES (?, ?, ?, ?, ?)", rows)
+
+    def record_resolutions(self, rows):
+        # rows: (time_resolved, robot_id, time_of_exception)
+        if not rows:
+            return
+        conn = self._connect()
+        with conn:
+            conn.executemany(
+                "UPDATE exceptions SET time_resolved = ? "
+                "WHERE robot_id = ? AND time_of_exception = ? AND time_resolved IS NULL", rows)
+
+    def complete(self, robot_id, robot_type, category, error, time_of_exception, time_handled, employee):
+        conn = self._connect()
+        with conn:
+            row = conn.execute(
+                "SELECT id FROM exceptions WHERE robot_id = ? AND time_of_exception = ? AND time_handled IS NULL "
+                "ORDER BY id LIMIT 1", (robot_id, time_of_exception)).fetchone()
+            if row is not None:
+                conn.execute("UPDATE exceptions SET time_handled = ?, employee = ? WHERE id = ?",
+                             (time_handled, employee, row[0]))
+                return row[0]
+            cur = conn.execute(
+                "INSERT INTO exceptions (robot_id, robot_type, category, error, time_of_exception, "
+                "time_handled, employee) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (robot_id, robot_type, category, error, time_of_exception, time_handled, employee))
+            return cur.lastrowid
+
+    def query(self, robot_id=None, category=None, since=None, until=None, employee=None, limit=None):
+        clauses, params = [], []
+        if robot_id is not None:
+            clauses.append("robot_id = ?")
+            params.append(robot_id)
+        if category is not None:
+            clauses.append("category = ?")
+            params.append(category)
+        if since is not None:
+            clauses.append("time_of_exception >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("time_of_exception < ?")
+            params.append(until)
+        if employee is not None:
+            clauses.append("employee = ?")
+            params.append(employee)
+
+        sql = f"SELECT {', '.join(COLUMNS)} FROM exceptions"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY time_of_exception"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [dict(zip(COLUMNS, row)) for row in self._connect().execute(sql, params)]
+
+    def completed_page(self, after=None, limit=200, robot_id=None, category=None, since=None, until=None,
+                       preview=120):
+        # Keyset pagination over handled incidents ordered by (time_handled, id);
+        # `after` is the (time_handled, id) of the last row already loaded.
+        clauses, params = ["time_handled IS NOT NULL"], []
+        if robot_id:
+            clauses.append("robot_id = ?")
+            params.append(robot_id)
+        if category:
+            clauses.append("category = ?")
+            params.append(category)
+        if since:
+            clauses.append("time_handled >= ?")
+            params.append(since)
+        if until:
+            clauses.append("time_handled < ?")
+            params.append(until)
+        if after is not None:
+            clauses.append("(time_handled > ? OR (time_handled = ? AND id > ?))")
+            params.extend((after[0], after[0], after[1]))
+        sql = ("SELECT id, robot_id, robot_type, substr(error, 1, ?), length(error), time_of_exception, "
+               "time_handled, category, employee FROM exceptions WHERE " + " AND ".join(clauses) +
+               " ORDER BY time_handled, id LIMIT ?")
+        return self._connect().execute(sql, [preview] + params + [limit]).fetchall()
+
+    def _range_clauses(self, since, until):
+        clauses, params = [], []
+        if since:
+            clauses.append("time_of_exception >= ?")
+            params.append(since)
+        if until:
+            clauses.append("time_of_exception < ?")
+            params.append(until)
+        return clauses, params
+
+    def count(self, since=None, until=None):
+        clauses, params = self._range_clauses(since, until)
+        sql = "SELECT COUNT(*) FROM exceptions" + (" WHERE " + " AND ".join(clauses) if clauses else "")
+        return self._connect().execute(sql, params).fetchone()[0]
+
+    def iter_chunks(self, since=None, until=None, chunk_size=1000):
+        # Yields lists of COLUMNS tuples ordered by (time_of_exception, id), one keyset page at a time,
+        # so a month of history never sits in memory at once
+        after = None
+        while True:
+            clauses, params = self._range_clauses(since, until)
+            if after is not None:
+                clauses.append("(time_of_exception > ? OR (time_of_exception = ? AND id > ?))")
+                params.extend((after[0], after[0], after[1]))
+            sql = f"SELECT {', '.join(COLUMNS)} FROM exceptions"
+            if clauses:
+                sql += " WHERE " + " AND ".join(clauses)
+            sql += " ORDER BY time_of_exception, id LIMIT ?"
+            rows = self._connect().execute(sql, params + [chunk_size]).fetchall()
+            if not rows:
+                return
+            yield rows
+            if len(rows) < chunk_size:
+                return
+            after = (rows[-1][5], rows[-1][0])
+
+    def import_offset(self, path):
+        row = self._connect().execute("SELECT offset FROM import_state WHERE path = ?", (path,)).fetchone()
+        return row[0] if row else 0
+
+    def import_batch(self, path, offset, exceptions, resolutions):
+        # exceptions: (robot_id, robot_type, category, error, time_of_exception, time_resolved, employee)
+        # resolutions: (time_resolved, robot_id, time_of_exception) for incidents imported earlier.
+        # Rows and the new offset commit together, so an interrupted import resumes without duplicates.
+        # Returns how many earlier incidents the resolutions actually closed.
+        conn = self._connect()
+        with conn:
+            conn.executemany(
+                "INSERT INTO exceptions (robot_id, robot_type, category, error, time_of_exception, time_resolved, "
+                "employee) VALUES (?, ?, ?, ?, ?, ?, ?)", exceptions)
+            resolved = conn.executemany(
+                "UPDATE exceptions SET time_resolved = ? "
+                "WHERE robot_id = ? AND time_of_exception = ? AND time_resolved IS NULL", resolutions).rowcount
+            conn.execute("INSERT OR REPLACE INTO import_state (path, offset, updated) VALUES (?, ?, ?)",
+                         (path, offset, datetime.datetime.now().strftime(TIME_FORMAT)))
+        return max(resolved, 0)
+
+    def error_text(self, incident_id):
+        row = self._connect().execute("SELECT error FROM exceptions WHERE id = ?", (incident_id,)).fetchone()
+        return row[0] if row else None
+
+    def categories(self):
+        return [row[0] for row in self._connect().execute(
+            "SELECT DISTINCT category FROM exceptions WHERE category IS NOT NULL ORDER BY category")]
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+_shared_store = None
+_shared_lock = threading.Lock()
+
+def get_history_store():
+    global _shared_store
+    with _shared_lock:
+        if _shared_store is None:
+            _shared_store = HistoryStore()
+        return _shared_store
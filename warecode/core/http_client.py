@@ -0,0 +1,83 @@
+import threading, time
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_HEADERS = {'Content-Type': 'application/json', 'accept': 'application/json'}
+
+class EssClient:
+    def __init__(self, connect_timeout=0.5, read_timeout=2.0, retries=2, read_retries=0, backoff=0.2,
+                 pool_size=4, gzip=True, headers=None):
+        self.timeout = (connect_timeout, read_timeout)
+        self.session = requests.Session()
+
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=read_retries,  # a read timeout on a 1 Hz poll is retried by the next tick, not inside this one
+            status=retries,
+            backoff_factor=backoff,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset(["GET"]),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self.session.headers.update(headers or DEFAULT_HEADERS)
+        if gzip:
+            self.session.headers["Accept-Encoding"] = "gzip, deflate"
+        else:
+            self.session.headers["Accept-Encoding"] = "identity"
+
+        self._lock = threading.Lock()
+        self.request_count = 0
+        self.error_count = 0
+        self.last_latency = 0.0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    def get(self, url, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        start = time.perf_counter()
+        try:
+            response = self.session.get(url, **kwargs)
+        except requests.RequestException:
+            self._record(time.perf_counter() - start, failed=True)
+            raise
+        self._record(time.perf_counter() - start, failed=response.status_code != 200)
+        return response
+
+    def _record(self, latency, failed=False):
+        with self._lock:
+            self.request_count += 1
+            if failed:
+                self.error_count += 1
+            self.last_latency = latency
+            self.total_latency += latency
+            self.max_latency = max(self.max_latency, latency)
+
+    def stats(self):
+        with self._lock:
+            count = self.request_count
+            return {
+                "requests": count,
+                "errors": self.error_count,
+                "last_ms": self.last_latency * 1000,
+                "avg_ms": (self.total_latency / count * 1000) if count else 0.0,
+                "max_ms": self.max_latency * 1000,
+            }
+
+    def close(self):
+        self.session.close()
+
+_shared_client = None
+_shared_lock = threading.Lock()
+
+def get_client():
+    global _shared_client
+    with _shared_lock:
+        if _shared_client is None:
+            _shared_client = EssClient()
+        return _shared_client
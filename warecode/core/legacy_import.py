@@ -0,0 +1,139 @@
+import os, re
+from concurrent.futures import ProcessPoolExecutor
+
+# Legacy exception.txt records, one per "kubot-N, ..." line plus any continuation lines:
+#   robot, error, time_of_exception, time_handled, employee          (early format)
+#   robot, robot_type, error, time_of_exception, time_handled        (later format, error may be a JSON array)
+# A "Resolved" record carries the start time of the incident it closes and the time it resolved.
+RECORD_START = re.compile(rb"^[A-Za-z]+-\d+, ")
+_TIME = r"\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}"
+RECORD = re.compile(rf"^(?P<robot>[A-Za-z]+-\d+), (?P<body>.*?), (?P<start>{_TIME}), (?P<end>{_TIME}|N/A)"
+                    r"(?:, (?P<extra>[^,\n]*))?\s*$", re.DOTALL)
+CHUNK_SIZE = 8 * 1024 * 1024
+
+def parse_record(text):
+    # Returns (robot, robot_type, error, time_of_exception, time_resolved, employee) or None if malformed
+    match = RECORD.match(text)
+    if match is None:
+        return None
+    body = match.group("body")
+    robot_type = None
+    employee = match.group("extra")
+    if employee is None:
+        robot_type, _, body = body.partition(", ")
+    else:
+        employee = employee.strip()
+    end = match.group("end")
+    return (match.group("robot"), robot_type, body.strip(), match.group("start"), None if end == "N/A" else end,
+            None if employee in (None, "", "N/A") else employee)
+
+def category_for(error):
+    return "System Exception" if error == "Command Timeout" else "Device Exception"
+
+def _split_records(data):
+    # Yields (offset, raw record bytes) for the record-aligned buffer
+    start = None
+    position = 0
+    for line in data.splitlines(keepends=True):
+        if RECORD_START.match(line):
+            if start is not None:
+                yield start, data[start:position]
+            start = position
+        position += len(line)
+    if start is not None:
+        yield start, data[start:position]
+
+def parse_chunk(path, start, end, final):
+    # Runs in a worker process. Returns (exceptions, resolutions, bad, resume offset); the last record of
+    # the file is left for the next run if it doesn't parse yet (still being written).
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+
+    opened = {}          # (robot, time_of_exception) -> exception row index, to pair within the chunk
+    exceptions, resolutions, bad = [], [], 0
+    resume = end
+    records = list(_split_records(data))
+    for i, (offset, raw) in enumerate(records):
+        record = parse_record(raw.decode("utf-8", errors="replace"))
+        if record is None:
+            if final and i == len(records) - 1:
+                resume = start + offset
+            else:
+                bad += 1
+            continue
+        robot, robot_type, error, time_of_exception, time_resolved, employee = record
+        key = (robot, time_of_exception)
+        if error == "Resolved":
+            row = opened.pop(key, None)
+            if row is not None:
+                exceptions[row][5] = time_resolved
+            else:
+                resolutions.append((time_resolved, robot, time_of_exception))
+            continue
+        opened[key] = len(exceptions)
+        exceptions.append([robot, robot_type, category_for(error), error, time_of_exception, None, employee])
+    return [tuple(row) for row in exceptions], resolutions, bad, resume
+
+def _next_record_start(f, position, size):
+    # First record start at or after position (skipping the partial line we may have landed in)
+    if position <= 0:
+        return 0
+    f.seek(position - 1)
+    f.readline()
+    while True:
+        here = f.tell()
+        line = f.readline()
+        if not line or here >= size:
+            return size
+        if RECORD_START.match(line):
+            return here
+
+def plan_chunks(path, start, size, chunk_size=CHUNK_SIZE):
+    bounds = [start]
+    with open(path, "rb") as f:
+        position = start + chunk_size
+        while position < size:
+            boundary = _next_record_start(f, position, size)
+            if boundary > bounds[-1]:
+                bounds.append(boundary)
+            position = max(position, boundary) + chunk_size
+    bounds.append(size)
+    return [(bounds[i], bounds[i + 1]) for i in range(len(bounds) - 1) if bounds[i + 1] > bounds[i]]
+
+def import_file(history, path, workers=None, chunk_size=CHUNK_SIZE, progress=None):
+    # Imports everything after the stored offset for this file; returns (incidents, resolutions, bad records)
+    path = os.path.abspath(path)
+    size = os.path.getsize(path)
+    start = history.import_offset(path)
+    if start > size:
+        print(f"⚠️ {path} is smaller than at the last import; re-importing from the start")
+        start = 0
+    chunks = plan_chunks(path, start, size, chunk_size)
+    if not chunks:
+        return 0, 0, 0
+
+    jobs = [(path, s, e, e == size) for s, e in chunks]
+    totals = [0, 0, 0]
+
+    def store(result):
+        exceptions, resolutions, bad, resume = result
+        # Chunks are committed in file order, so a resolution always finds an incident imported before it
+        resolved = history.import_batch(path, resume, exceptions, resolutions)
+        totals[0] += len(exceptions)
+        totals[1] += resolved + sum(1 for row in exceptions if row[5] is not None)
+        totals[2] += bad
+        if progress is not None:
+            progress(resume - start, size - start)
+
+    if len(jobs) == 1:
+        store(parse_chunk(*jobs[0]))  # not worth starting processes for
+    else:
+        workers = workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # A few chunks in flight per worker keeps every core busy without queuing the whole file's results
+            window = workers * 2
+            for i in range(0, len(jobs), window):
+                for result in pool.map(parse_chunk, *zip(*jobs[i:i + window])):
+                    store(result)
+    return tuple(totals)
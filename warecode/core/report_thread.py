@@ -0,0 +1,31 @@
+from PyQt5.QtCore import QThread, pyqtSignal
+from .reporting import export_history, ReportCancelled
+
+class ReportThread(QThread):
+    progress_signal = pyqtSignal(int, int)     # rows written, total rows
+    done_signal = pyqtSignal(list, int)        # files written, rows written
+    failed_signal = pyqtSignal(str)
+
+    def __init__(self, history, path, since=None, until=None):
+        super().__init__()
+        self.history = history
+        self.path = path
+        self.since = since
+        self.until = until
+        self._cancelled = False
+
+    def run(self):
+        try:
+            paths, rows = export_history(self.history, self.path, self.since, self.until,
+                                         progress=self.progress_signal.emit, cancelled=lambda: self._cancelled)
+            self.done_signal.emit(paths, rows)
+        except ReportCancelled:
+            self.failed_signal.emit("Export cancelled")
+        except Exception as e:
+            print(f"🚨 Report export failed: {e}")
+            self.failed_signal.emit(str(e))
+        finally:
+            self.history.close()  # only this thread's connection
+
+    def cancel(self):
+        self._cancelled = True
@@ -0,0 +1,131 @@
+import csv, datetime, os
+from .history import COLUMNS, TIME_FORMAT
+
+try:
+    import openpyxl
+except ImportError:
+    openpyxl = None
+
+HEADERS = ["ID", "Robot ID", "Robot Type", "Category", "Error JSON", "Time of Exception", "Time Resolved",
+           "Time Handled", "Employee"]
+SUMMARY_HEADERS = ["Group", "Key", "Incidents", "Resolved", "Handled", "Avg Minutes to Handle"]
+GROUPS = (("Robot", COLUMNS.index("robot_id")), ("Category", COLUMNS.index("category")),
+          ("Employee", COLUMNS.index("employee")))
+XLSX_CELL_LIMIT = 32767
+
+_TIME_OF_EXCEPTION = COLUMNS.index("time_of_exception")
+_TIME_RESOLVED = COLUMNS.index("time_resolved")
+_TIME_HANDLED = COLUMNS.index("time_handled")
+
+class ReportCancelled(Exception):
+    pass
+
+def _parse_time(value):
+    try:
+        return datetime.datetime.strptime(value, TIME_FORMAT)
+    except (TypeError, ValueError):
+        return None
+
+class Aggregates:
+    # Running per-robot/category/employee totals; memory grows with distinct keys, not with rows
+    def __init__(self):
+        self.groups = {name: {} for name, _ in GROUPS}
+
+    def add(self, row):
+        resolved = bool(row[_TIME_RESOLVED])
+        handled = row[_TIME_HANDLED] not in (None, "", "N/A")
+        minutes = None
+        if handled:
+            start, end = _parse_time(row[_TIME_OF_EXCEPTION]), _parse_time(row[_TIME_HANDLED])
+            if start is not None and end is not None:
+                minutes = (end - start).total_seconds() / 60
+        for name, column in GROUPS:
+            stats = self.groups[name].get(row[column] or "")
+            if stats is None:
+                stats = self.groups[name][row[column] or ""] = [0, 0, 0, 0.0, 0]
+            stats[0] += 1
+            stats[1] += resolved
+            stats[2] += handled
+            if minutes is not None:
+                stats[3] += minutes
+                stats[4] += 1
+
+    def rows(self):
+        for name, _ in GROUPS:
+            for key, (count, resolved, handled, minutes, timed) in sorted(self.groups[name].items(),
+                                                                          key=lambda item: -item[1][0]):
+                yield [name, key, count, resolved, handled, round(minutes / timed, 1) if timed else None]
+
+class _CsvWriter:
+    def __init__(self, path):
+        self.paths = [path, os.path.splitext(path)[0] + "_summary.csv"]
+        self._file = open(path, "w", newline="", encoding="utf-8-sig")  # BOM so Excel reads UTF-8
+        self._rows = csv.writer(self._file)
+        self._rows.writerow(HEADERS)
+
+    def write_rows(self, rows):
+        self._rows.writerows(rows)
+
+    def finish(self, aggregates):
+        self._file.close()
+        with open(self.paths[1], "w", newline="", encoding="utf-8-sig") as f:
+            writer = csv.writer(f)
+            writer.writerow(SUMMARY_HEADERS)
+            writer.writerows(aggregates.rows())
+
+    def abort(self):
+        self._file.close()
+        os.remove(self.paths[0])
+
+class _XlsxWriter:
+    def __init__(self, path):
+        if openpyxl is None:
+            raise RuntimeError("openpyxl is not installed; export to .csv instead")
+        self.paths = [path]
+        # Write-only workbooks stream rows to disk instead of keeping every cell in memory
+        self._book = openpyxl.Workbook(write_only=True)
+        self._sheet = self._book.create_sheet("Exceptions")
+        self._sheet.append(HEADERS)
+
+    def write_rows(self, rows):
+        error = COLUMNS.index("error")
+        for row in rows:
+            if row[error] and len(row[error]) > XLSX_CELL_LIMIT:
+                row = row[:error] + (row[error][:XLSX_CELL_LIMIT - 1] + "…",) + row[error + 1:]
+            self._sheet.append(row)
+
+    def finish(self, aggregates):
+        sheets = {}
+        for row in aggregates.rows():
+            sheet = sheets.get(row[0])
+            if sheet is None:
+                sheet = sheets[row[0]] = self._book.create_sheet(f"By {row[0]}")
+                sheet.append(SUMMARY_HEADERS[1:])
+            sheet.append(row[1:])
+        self._book.save(self.paths[0])
+
+    def abort(self):
+        self._book.close()
+
+def export_history(history, path, since=None, until=None, progress=None, cancelled=None, chunk_size=1000):
+    # Streams exceptions between since/until into path (.xlsx or .csv) plus per-robot/category/employee
+    # summaries. progress(done, total) is called after every chunk; a truthy cancelled() stops the export.
+    writer = _XlsxWriter(path) if path.lower().endswith(".xlsx") else _CsvWriter(path)
+    aggregates = Aggregates()
+    total = history.count(since, until)
+    done = 0
+    try:
+        for rows in history.iter_chunks(since, until, chunk_size):
+            if cancelled is not None and cancelled():
+                raise ReportCancelled()
+            writer.write_rows(rows)
+            for row in rows:
+                aggregates.add(row)
+            done += len(rows)
+            if progress is not None:
+                progress(done, total)
+        writer.finish(aggregates)
+    except BaseException:
+        writer.abort()
+        raise
+    return writer.paths, done
@@ -0,0 +1,42 @@
+from .snapshot import FleetSnapshot
+
+TRACKED_FIELDS = ("hardwareState", "state", "errorState", "energyLevel", "isCommandTimeout")
+
+class StateDelta:
+    __slots__ = ("added", "changed", "removed", "fleet")
+
+    def __init__(self, added=None, changed=None, removed=None, fleet=None):
+        self.added = added or []      # RobotSnapshot
+        self.changed = changed or []  # RobotSnapshot
+        self.removed = removed or []  # robot codes
+        self.fleet = fleet            # the full FleetSnapshot this delta leads to
+
+    def __bool__(self):
+        return bool(self.added or self.changed or self.removed)
+
+class RobotStateStore:
+    def __init__(self):
+        self.fleet = FleetSnapshot(())
+
+    def __len__(self):
+        return len(self.fleet)
+
+    def update(self, fleet):
+        delta = StateDelta(fleet=fleet)
+        previous = self.fleet.by_code
+
+        for robot in fleet:
+            old = previous.get(robot.code)
+            if old is None:
+                delta.added.append(robot)
+            elif old.key != robot.key:
+                delta.changed.append(robot)
+
+        for code in previous.keys() - fleet.by_code.keys():
+            delta.removed.append(code)
+
+        self.fleet = fleet
+        return delta
+
+    def clear(self):
+        self.fleet = FleetSnapshot(())
@@ -0,0 +1,181 @@
+import json, os, string, threading
+from .error_signature import summarise_errors
+
+RULES_FILE = os.path.join(os.path.dirname(__file__), "..", "resources", "rules.json")
+
+# Rule fields use the ESS payload names; these map them onto RobotSnapshot
+FIELDS = {
+    "code": lambda robot: robot.code,
+    "robotTypeCode": lambda robot: robot.robot_type.code,
+    "hardwareState": lambda robot: robot.hardware_state,
+    "state": lambda robot: robot.state,
+    "energyLevel": lambda robot: robot.energy_level,
+    "isCommandTimeout": lambda robot: robot.command_timeout,
+    "isCharging": lambda robot: robot.is_charging,
+    "locationState": lambda robot: robot.location_state,
+    "errorState": lambda robot: robot.errors,
+    "source": lambda robot: robot.source,
+    "stuckSeconds": lambda robot: robot.stuck_seconds,
+    "lockedCongestion": lambda robot: robot.congestion,
+}
+
+def _cmp(op):
+    def check(actual, expected):
+        return actual is not None and op(actual, expected)
+    return check
+
+OPS = {
+    "eq": lambda actual, expected: actual == expected,
+    "ne": lambda actual, expected: actual != expected,
+    "lt": _cmp(lambda a, b: a < b),
+    "le": _cmp(lambda a, b: a <= b),
+    "gt": _cmp(lambda a, b: a > b),
+    "ge": _cmp(lambda a, b: a >= b),
+    "in": lambda actual, expected: actual in expected,
+    "truthy": lambda actual, expected: bool(actual),
+    "falsy": lambda actual, expected: not actual,
+}
+
+# Same behaviour the monitor had before rules were configurable
+DEFAULT_RULES = [
+    {"name": "device_fault", "category": "Device Exception", "detail": "$errors", "urgent": True,
+     "when": [{"field": "hardwareState", "op": "eq", "value": "ROBOT_ABNORMAL"},
+              {"field": "errorState", "op": "truthy"}]},
+    {"name": "command_timeout", "category": "System Exception", "detail": "Command Timeout", "urgent": True,
+     "when": [{"field": "isCommandTimeout", "op": "truthy"}]},
+]
+
+class RuleError(ValueError):
+    pass
+
+class Rule:
+    __slots__ = ("name", "category", "priority", "detail", "conditions", "urgent")
+
+    def __init__(self, name, category, priority, detail, conditions, urgent=False):
+        self.name = name
+        self.category = category
+        self.priority = priority
+        self.detail = detail
+        self.conditions = conditions  # [(getter, op, value)]
+        self.urgent = urgent          # polls at the scheduler's fast rate while any robot matches
+
+    def matches(self, robot):
+        for getter, op, value in self.conditions:
+            if not op(getter(robot), value):
+                return False
+        return True
+
+    def describe(self, robot):
+        if self.detail == "$errors":
+            return summarise_errors(robot.errors)
+        return self.detail.format(**{field: getter(robot) for field, getter in FIELDS.items()})
+
+def check_detail(name, detail):
+    # A bad placeholder would otherwise raise on every tick for every matching robot
+    if detail == "$errors":
+        return
+    try:
+        parsed = list(string.Formatter().parse(detail))
+    except ValueError as e:
+        raise RuleError(f"{name}: bad detail template: {e}")
+    for _, field, _, _ in parsed:
+        if field is None:
+            continue
+        base = field.split(".", 1)[0].split("[", 1)[0]
+        if base not in FIELDS:
+            raise RuleError(f"{name}: unknown placeholder {{{field}}} in detail")
+
+def compile_rule(spec, priority):
+    name = spec.get("name", f"rule_{priority}")
+    detail = spec.get("detail", name)
+    check_detail(name, detail)
+    conditions = []
+    index_key = None
+    for cond in spec.get("when", []):
+        field, op_name = cond.get("field"), cond.get("op", "eq")
+        if field not in FIELDS:
+            raise RuleError(f"{name}: unknown field {field!r}")
+        if op_name not in OPS:
+            raise RuleError(f"{name}: unknown op {op_name!r}")
+        value = cond.get("value")
+        if op_name == "in":
+            value = frozenset(value or ())
+        conditions.append((FIELDS[field], OPS[op_name], value))
+        # The first equality test becomes the rule's index key
+        if index_key is None and op_name == "eq":
+            index_key = (field, value)
+    if not conditions:
+        raise RuleError(f"{name}: rule has no conditions")
+    rule = Rule(name, spec.get("category", "System Exception"), priority, detail, conditions,
+                bool(spec.get("urgent", False)))
+    return rule, index_key
+
+class RuleEngine:
+    def __init__(self, specs=None):
+        self.rules = []
+        self._indexed = {}     # field -> {value: [rule]}
+        self._unindexed = []   # rules without an equality test, always candidates
+        for priority, spec in enumerate(specs if specs is not None else DEFAULT_RULES):
+            if not spec.get("enabled", True):
+                continue
+            try:
+                rule, index_key = compile_rule(spec, priority)
+            except RuleError as e:
+                # One bad rule is dropped at load time; the rest keep working
+                print(f"⚠️ Skipping rule: {e}")
+                continue
+            self.rules.append(rule)
+            if index_key is None:
+                self._unindexed.append(rule)
+            else:
+                field, value = index_key
+                self._indexed.setdefault(field, {}).setdefault(value, []).append(rule)
+        self.evaluate = self._build()
+
+    def _build(self):
+        # Resolve the index lookups once so a poll pays one dict hit per indexed field,
+        # then only runs the rules that could possibly match, in priority order.
+        lookups = tuple((FIELDS[field], buckets) for field, buckets in self._indexed.items())
+        unindexed = tuple(self._unindexed)
+        single = len(lookups) == 0
+
+        def evaluate(robot):
+            if single:
+                candidates = unindexed
+            else:
+                candidates = list(unindexed)
+                for getter, buckets in lookups:
+                    bucket = buckets.get(getter(robot))
+                    if bucket:
+                        candidates.extend(bucket)
+                if len(candidates) > 1:
+                    candidates.sort(key=_priority)
+            for rule in candidates:
+                if rule.matches(robot):
+                    return rule
+            return None
+
+        return evaluate
+
+def _priority(rule):
+    return rule.priority
+
+def load_rules(path=RULES_FILE):
+    try:
+        with open(path, "r") as f:
+            return RuleEngine(json.load(f).get("rules", []))
+    except FileNotFoundError:
+        return RuleEngine()
+    except Exception as e:
+        print(f"⚠️ Could not load rules, using defaults: {e}")
+        return RuleEngine()
+
+_shared_engine = None
+_shared_lock = threading.Lock()
+
+def get_rule_engine():
+    global _shared_engine
+    with _shared_lock:
+        if _shared_engine is None:
+            _shared_engine = load_rules()
+        return _shared_engine
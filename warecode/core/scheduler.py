@@ -0,0 +1,41 @@
+import math, threading, time
+
+class PollScheduler:
+    def __init__(self, interval=1.0, fast_interval=0.25, max_backoff=30.0):
+        self.interval = interval
+        self.fast_interval = fast_interval
+        self.max_backoff = max_backoff
+        self.failures = 0
+        self._stop = threading.Event()
+        self._next = time.monotonic()
+
+    @property
+    def stopped(self):
+        return self._stop.is_set()
+
+    def tick_done(self, ok=True, urgent=False):
+        now = time.monotonic()
+        if not ok:
+            self.failures += 1
+            self._next = now + min(self.interval * 2 ** self.failures, self.max_backoff)
+            return
+
+        if self.failures:
+            # First good tick after an outage restarts the cadence from now
+            self.failures = 0
+            self._next = now
+        period = self.fast_interval if urgent else self.interval
+        self._next += period
+        if self._next <= now:
+            # Overran one or more slots: skip them instead of firing back-to-back
+            self._next += period * math.ceil((now - self._next) / period)
+        elif self._next - now > period:
+            # Switched to the fast rate mid-period
+            self._next = now + period
+
+    def wait(self):
+        # Returns False once stop() has been called; stop() wakes the wait immediately
+        return not self._stop.wait(max(0.0, self._next - time.monotonic()))
+
+    def stop(self):
+        self._stop.set()
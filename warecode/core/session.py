@@ -1,6 +1,7 @@
-import json, os, datetime
+import json, os, datetime, threading, queue
 
 SESSION_FILE = os.path.join(os.path.dirname(__file__), "..", "resources", "session.json")
+JOURNAL_FILE = os.path.join(os.path.dirname(__file__), "..", "resources", "session.journal.jsonl")
 
 def start_session(employee_name):
     session = {
@@ -8,20 +9,107 @@ def start_session(employee_name):
         "start_time": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
         "completed_exceptions": []
     }
-    with open(SESSION_FILE, "w", encoding="utf-8") as f:
-        json.dump(session, f, indent=2)
+    save_session(session)
+    _remove(JOURNAL_FILE)
+    return session
+
+def replay_journal(session, path=JOURNAL_FILE):
+    if not os.path.exists(path):
+        return session
+    completed = session.setdefault("completed_exceptions", [])
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                completed.append(json.loads(line))
+            except ValueError:
+                # A torn final line from a crash mid-write; everything before it is intact
+                print("⚠️ Skipping corrupt journal entry")
     return session
 
 def load_session():
     if os.path.exists(SESSION_FILE):
         with open(SESSION_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
+            session = json.load(f)
+        return replay_journal(session)
     return None
 
 def save_session(session):
-    with open(SESSION_FILE, "w", encoding="utf-8") as f:
+    tmp_path = SESSION_FILE + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
         json.dump(session, f, indent=2)
+    os.replace(tmp_path, SESSION_FILE)
+
+def compact_session(session):
+    # Fold the journal into the snapshot, then start an empty journal
+    save_session(session)
+    _remove(JOURNAL_FILE)
 
 def clear_session():
-    if os.path.exists(SESSION_FILE):
-        os.remove(SESSION_FILE)
+    _remove(SESSION_FILE)
+    _remove(JOURNAL_FILE)
+
+def _remove(path):
+    if os.path.exists(path):
+        os.remove(path)
+
+class SessionJournal:
+    def __init__(self, path=JOURNAL_FILE, flush_interval=1.0, batch_size=64):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._queue = queue.Queue()
+        self.closed = False
+        self._writer = threading.Thread(target=self._run, name="session-journal", daemon=True)
+        self._writer.start()
+
+    def append(self, record):
+        if self.closed:
+            raise RuntimeError("journal is closed")
+        self._queue.put(record)
+
+    def _run(self):
+        with open(self.path, "a", encoding="utf-8") as f:
+            if not self._ends_with_newline():
+                f.write("\n")  # don't glue new records onto a torn last line
+            stopping = False
+            while not stopping:
+                try:
+                    item = self._queue.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    continue
+                batch = []
+                while True:
+                    if item is None:
+                        stopping = True
+                    else:
+                        batch.append(item)
+                    if stopping or len(batch) >= self.batch_size:
+                        break
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                if batch:
+                    f.write("".join(json.dumps(record, ensure_ascii=False) + "\n" for record in batch))
+                    f.flush()
+                    os.fsync(f.fileno())
+
+    def _ends_with_newline(self):
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(0, os.SEEK_END)
+                if f.tell() == 0:
+                    return True
+                f.seek(-1, os.SEEK_END)
+                return f.read(1) == b"\n"
+        except OSError:
+            return True
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self._queue.put(None)
+            self._writer.join()
@@ -0,0 +1,189 @@
+import bisect, gzip, json, random, threading, time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from .ess_poller import QUERY_PATH
+
+DISLOCATION = {"type": "2147485189", "node": "command_0000000000", "code": "393217",
+               "info": "[APPROCH_TARGETS] actuator(lift) report dislocation!"}
+UNDER_VOLTAGE = {"type": "2147484416", "node": "lift_motor", "code": "2",
+                 "info": "Action(MonitorHealth) produce an error([MonitorHealth] servo_motor(servomotor_lift) with "
+                         "fault state(time={time} info={{\"E_HAIROU_UNDER_VOLTAGE.N_DEVICE_PROCESS.N_DRIVER_SERVOMOTOR."
+                         "N_SERVOMOTOR_LIFT\":\"DC-Bus under voltage\"}}))"}
+
+class SyntheticFleet:
+    # Random-walk fleet: each tick a healthy robot faults with `fault_rate`, a faulty one recovers with `recover_rate`.
+    # `bloat` scales the ballast (locked points, repeated error entries) the real ESS sends.
+    def __init__(self, robots=700, fault_rate=0.001, timeout_rate=0.0005, recover_rate=0.05, bloat=1, seed=None):
+        self.rng = random.Random(seed)
+        self.fault_rate = fault_rate
+        self.timeout_rate = timeout_rate
+        self.recover_rate = recover_rate
+        self.bloat = bloat
+        self.tick_count = 0
+        self.robots = [self._new_robot(i) for i in range(1, robots + 1)]
+
+    def _new_robot(self, number):
+        return {
+            "id": str(1810704293498457600 + number),
+            "code": f"kubot-{number}",
+            "robotTypeCode": "RT_KUBOT" if number % 5 == 0 else "RT_KUBOT_MINI_HAIFLEX",
+            "state": "IDLE",
+            "mode": "AUTO",
+            "paused": False,
+            "energyLevel": self.rng.randint(30, 100),
+            "hardwareState": "ROBOT_NORMAL",
+            "isCharging": False,
+            "isCommandTimeout": False,
+            "precisePosition": {"x": self.rng.randint(0, 200000), "y": self.rng.randint(0, 80000), "z": 0},
+            "lockedStatePointCode": [],
+            "otherHardwareInfo": {
+                "hardwareErrDesc": "",
+                "errorState": [],
+                "locationState": "SUCCESS",
+                "batteryInfo": {"voltage": "46210", "current": "-1300", "cycle": 108, "soh": 100, "temperature": 24},
+                "speed": {"x": "0", "y": "0", "t": "0"},
+            },
+        }
+
+    def tick(self):
+        self.tick_count += 1
+        rng = self.rng
+        stamp = time.strftime("%Y-%m-%d %H:%M:%S")
+        for robot in self.robots:
+            info = robot["otherHardwareInfo"]
+            if robot["hardwareState"] == "ROBOT_ABNORMAL" or robot["isCommandTimeout"]:
+                if rng.random() < self.recover_rate:
+                    robot["hardwareState"] = "ROBOT_NORMAL"
+                    robot["isCommandTimeout"] = False
+                    info["errorState"] = []
+            elif rng.random() < self.fault_rate:
+                robot["hardwareState"] = "ROBOT_ABNORMAL"
+                template = DISLOCATION if rng.random() < 0.7 else UNDER_VOLTAGE
+                entry = dict(template, info=template["info"].format(time=stamp + ".000000"))
+                info["errorState"] = [entry] * rng.randint(1, 12 * self.bloat)
+            elif rng.random() < self.timeout_rate:
+                robot["isCommandTimeout"] = True
+
+            if not robot["isCharging"]:
+                robot["energyLevel"] = max(0, robot["energyLevel"] - (1 if rng.random() < 0.01 else 0))
+            step = rng.randint(-500, 500)
+            position = robot["precisePosition"]
+            position["x"] += step
+            x, y = position["x"], position["y"]
+            info["speed"]["x"] = str(abs(step))
+            robot["lockedStatePointCode"] = [f"POINT:{x}:{y - 490 * i}#270" for i in range(8 * self.bloat)]
+
+    def payload(self):
+        return json.dumps({"code": 0, "msg": "success", "data": {"robot": self.robots}}).encode("utf-8")
+
+class Recording:
+    # Frames captured by record(): gzip JSON Lines of {"t": seconds from start, "body": response text}
+    def __init__(self, path):
+        self.times, self.frames = [], []
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                frame = json.loads(line)
+                self.times.append(frame["t"])
+                self.frames.append(frame["body"].encode("utf-8"))
+        if not self.frames:
+            raise ValueError(f"{path} has no frames")
+        self.duration = self.times[-1]
+
+    def frame_at(self, elapsed, loop=True):
+        if loop and self.duration > 0:
+            elapsed %= self.duration
+        return self.frames[max(0, bisect.bisect_right(self.times, elapsed) - 1)]
+
+def _last_offset(path):
+    # "t" of the last frame already in the file, or None for a new/empty one
+    last = None
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    last = json.loads(line)["t"]
+    except FileNotFoundError:
+        pass
+    return last
+
+def record(client, url, path, interval=1.0, duration=None):
+    # Appending to an existing recording continues its timeline one interval after the last frame,
+    # so Recording's bisect over the offsets still sees them in order
+    last = _last_offset(path)
+    offset = 0.0 if last is None else last + interval
+    start = time.monotonic()
+    frames = 0
+    with gzip.open(path, "at", encoding="utf-8") as f:
+        while duration is None or time.monotonic() - start < duration:
+            tick_start = time.monotonic()
+            try:
+                response = client.get(url)
+                if response.status_code == 200:
+                    f.write(json.dumps({"t": round(offset + tick_start - start, 3), "body": response.text}) + "\n")
+                    frames += 1
+            except Exception as e:
+                print(f"🚨 Record error: {e}")
+            time.sleep(max(0.0, interval - (time.monotonic() - tick_start)))
+    return frames
+
+class EssSimulator:
+    # Serves ess-api/model/queryModelByType from a SyntheticFleet or a Recording; `speed` scales time
+    def __init__(self, source, host="127.0.0.1", port=9000, speed=1.0, tick_interval=1.0):
+        self.source = source
+        self.speed = speed
+        self.tick_interval = tick_interval
+        self.start = time.monotonic()
+        self.requests = 0
+        self._lock = threading.Lock()
+        simulator = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, like the real ESS
+
+            def do_GET(self):
+                if QUERY_PATH.split("?")[0] not in self.path:
+                    self.send_error(404)
+                    return
+                body = simulator.current_body()
+                gzipped = "gzip" in self.headers.get("Accept-Encoding", "")
+                if gzipped:
+                    body = gzip.compress(body, compresslevel=1)
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                if gzipped:
+                    self.send_header("Content-Encoding", "gzip")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._http = ThreadingHTTPServer((host, port), Handler)
+        self._http.daemon_threads = True
+        self.address = self._http.server_address
+
+    def elapsed(self):
+        return (time.monotonic() - self.start) * self.speed
+
+    def current_body(self):
+        with self._lock:
+            self.requests += 1
+            if isinstance(self.source, Recording):
+                return self.source.frame_at(self.elapsed())
+            # Advance the synthetic fleet to simulated "now"
+            target = int(self.elapsed() / self.tick_interval)
+            while self.source.tick_count < target:
+                self.source.tick()
+            return self.source.payload()
+
+    def serve_forever(self):
+        self._http.serve_forever()
+
+    def start_background(self):
+        thread = threading.Thread(target=self._http.serve_forever, name="ess-simulator", daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self):
+        self._http.shutdown()
+        self._http.server_close()
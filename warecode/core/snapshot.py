@@ -0,0 +1,128 @@
+import sys, time
+from .error_signature import error_signatures
+
+ROBOT_ABNORMAL = "ROBOT_ABNORMAL"
+
+class RobotType:
+    __slots__ = ("code", "display")
+
+    def __init__(self, code, display):
+        self.code = code
+        self.display = display
+
+    def __repr__(self):
+        return f"RobotType({self.code!r})"
+
+# Table-driven replacement for the old if/elif on robotTypeCode
+ROBOT_TYPES = {
+    "RT_KUBOT": RobotType("RT_KUBOT", "Big Robot"),
+    "RT_KUBOT_MINI_HAIFLEX": RobotType("RT_KUBOT_MINI_HAIFLEX", "Small Robot"),
+}
+
+def robot_type(code):
+    rt = ROBOT_TYPES.get(code)
+    if rt is None:
+        rt = ROBOT_TYPES[code] = RobotType(code, "Unknown Type")
+    return rt
+
+_states = {}
+
+def intern_state(value):
+    # State strings repeat across the whole fleet every tick; keep one shared object per value
+    try:
+        return _states[value]
+    except KeyError:
+        interned = _states[value] = sys.intern(value) if isinstance(value, str) else value
+        return interned
+
+class RobotSnapshot:
+    __slots__ = ("code", "source", "robot_type", "state", "hardware_state", "energy_level",
+                 "command_timeout", "errors", "error_sigs", "location_state", "is_charging", "stuck_seconds",
+                 "congestion", "stale")
+
+    def __init__(self, code, source, robot_type, state, hardware_state, energy_level, command_timeout,
+                 errors, error_sigs, location_state=None, is_charging=False, stuck_seconds=0.0, congestion=0,
+                 stale=False):
+        self.code = code
+        self.source = source
+        self.robot_type = robot_type
+        self.state = state
+        self.hardware_state = hardware_state
+        self.energy_level = energy_level
+        self.command_timeout = command_timeout
+        self.errors = errors
+        self.error_sigs = error_sigs
+        self.location_state = location_state
+        self.is_charging = is_charging
+        self.stuck_seconds = stuck_seconds  # set by the spatial index, not part of the ESS payload
+        self.congestion = congestion
+        self.stale = stale  # carried over from the last good answer of an ESS that failed this tick
+
+    @classmethod
+    def from_record(cls, robot):
+        hardware_info = robot.get("otherHardwareInfo", {})
+        errors = hardware_info.get("errorState", [])
+        return cls(
+            robot.get("code", "Unknown Robot"),
+            intern_state(robot.get("source", "")),
+            robot_type(robot.get("robotTypeCode", "UNKNOWN")),
+            intern_state(robot.get("state", "UNKNOWN")),
+            intern_state(robot.get("hardwareState", "UNKNOWN")),
+            robot.get("energyLevel"),
+            bool(robot.get("isCommandTimeout", False)),
+            errors,
+            error_signatures(errors),
+            intern_state(hardware_info.get("locationState")),
+            bool(robot.get("isCharging", False)),
+            robot.get("stuckSeconds", 0.0),
+            robot.get("lockedCongestion", 0),
+            bool(robot.get("stale", False)),
+        )
+
+    def to_record(self):
+        # Inverse of from_record, in ESS field names (used to ship snapshots to other processes)
+        return {
+            "code": self.code,
+            "source": self.source,
+            "robotTypeCode": self.robot_type.code,
+            "state": self.state,
+            "hardwareState": self.hardware_state,
+            "energyLevel": self.energy_level,
+            "isCommandTimeout": self.command_timeout,
+            "otherHardwareInfo": {"errorState": self.errors, "locationState": self.location_state},
+            "isCharging": self.is_charging,
+            "stuckSeconds": self.stuck_seconds,
+            "lockedCongestion": self.congestion,
+            "stale": self.stale,
+        }
+
+    @property
+    def key(self):
+        # What counts as a change between polls
+        return (self.hardware_state, self.state, self.error_sigs, self.energy_level, self.command_timeout,
+                self.location_state, self.stale)
+
+    @property
+    def display_type(self):
+        return self.robot_type.display
+
+    @property
+    def abnormal(self):
+        return self.hardware_state == ROBOT_ABNORMAL
+
+class FleetSnapshot:
+    __slots__ = ("robots", "by_code", "taken_at")
+
+    def __init__(self, robots, taken_at=None):
+        self.robots = tuple(robots)
+        self.by_code = {robot.code: robot for robot in self.robots}
+        self.taken_at = time.time() if taken_at is None else taken_at
+
+    def __len__(self):
+        return len(self.robots)
+
+    def __iter__(self):
+        return iter(self.robots)
+
+    def get(self, code):
+        return self.by_code.get(code)
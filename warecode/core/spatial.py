@@ -0,0 +1,132 @@
+import math, threading
+
+# Positions and locked points are in millimetres, as the ESS reports them
+CELL_SIZE = 2000
+STUCK_RADIUS = 1000
+CONGESTION_CELL_SIZE = 2000
+
+def parse_point(code):
+    # "POINT:108095:31930#180" -> (108095, 31930)
+    try:
+        _, x, y = code.split("#", 1)[0].split(":")
+        return int(x), int(y)
+    except (AttributeError, ValueError):
+        return None
+
+def _position(robot):
+    position = robot.get("precisePosition")
+    if not isinstance(position, dict):
+        return None
+    try:
+        return float(position["x"]), float(position["y"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+class _Tracked:
+    __slots__ = ("cell", "anchor", "since", "locked", "locked_cells")
+
+    def __init__(self):
+        self.cell = None
+        self.anchor = None       # position the robot has stayed within STUCK_RADIUS of
+        self.since = 0.0
+        self.locked = ()         # raw lockedStatePointCode, to skip unchanged lists
+        self.locked_cells = frozenset()
+
+class SpatialIndex:
+    # Uniform grid over the floor, updated incrementally each poll:
+    #   cell -> robot codes currently in it, and cell -> number of robots holding reservations in it.
+    # A robot only touches the cells it left/entered, so a tick costs O(moved robots + changed locks).
+    def __init__(self, cell_size=CELL_SIZE, stuck_radius=STUCK_RADIUS, congestion_cell_size=CONGESTION_CELL_SIZE):
+        self.cell_size = cell_size
+        self.stuck_radius = stuck_radius
+        self.congestion_cell_size = congestion_cell_size
+        self._lock = threading.Lock()
+        self._robots = {}        # code -> _Tracked
+        self._cells = {}         # cell -> set of codes
+        self._reservations = {}  # congestion cell -> robots with locked points there
+
+    def _cell(self, x, y, size):
+        return int(x // size), int(y // size)
+
+    def update(self, robots, now):
+        # Stamps each record with "stuckSeconds" and "lockedCongestion" for the rule engine
+        with self._lock:
+            seen = set()
+            updated = []
+            for robot in robots:
+                code = robot.get("code")
+                seen.add(code)
+                if robot.get("stale"):
+                    continue  # keep its last known cell and reservations until fresh data arrives
+                tracked = self._robots.get(code)
+                if tracked is None:
+                    tracked = self._robots[code] = _Tracked()
+                self._move(code, tracked, _position(robot), now)
+                self._reserve(tracked, robot.get("lockedStatePointCode") or ())
+                updated.append((robot, tracked))
+            for code in self._robots.keys() - seen:
+                tracked = self._robots.pop(code)
+                self._move(code, tracked, None, now)
+                self._reserve(tracked, ())
+            # Stamp only once the whole grid reflects this poll, so congestion doesn't depend on list order
+            for robot, tracked in updated:
+                robot["stuckSeconds"] = now - tracked.since if tracked.anchor is not None else 0.0
+                robot["lockedCongestion"] = max((self._reservations[cell] for cell in tracked.locked_cells), default=0)
+
+    def _move(self, code, tracked, position, now):
+        cell = self._cell(*position, self.cell_size) if position is not None else None
+        if cell != tracked.cell:
+            if tracked.cell is not None:
+                members = self._cells[tracked.cell]
+                members.discard(code)
+                if not members:
+                    del self._cells[tracked.cell]
+            if cell is not None:
+                self._cells.setdefault(cell, set()).add(code)
+            tracked.cell = cell
+        if position is None:
+            tracked.anchor = None
+        elif tracked.anchor is None or math.dist(position, tracked.anchor) > self.stuck_radius:
+            tracked.anchor = position
+            tracked.since = now
+
+    def _reserve(self, tracked, locked):
+        if locked == tracked.locked:
+            return
+        size = self.congestion_cell_size
+        cells = frozenset(self._cell(*point, size) for point in map(parse_point, locked) if point is not None)
+        for cell in tracked.locked_cells - cells:
+            count = self._reservations[cell] - 1
+            if count:
+                self._reservations[cell] = count
+            else:
+                del self._reservations[cell]
+        for cell in cells - tracked.locked_cells:
+            self._reservations[cell] = self._reservations.get(cell, 0) + 1
+        tracked.locked = list(locked)
+        tracked.locked_cells = cells
+
+    def robots_near(self, x, y, radius):
+        # Only the cells overlapping the radius are visited
+        size = self.cell_size
+        x0, y0 = self._cell(x - radius, y - radius, size)
+        x1, y1 = self._cell(x + radius, y + radius, size)
+        with self._lock:
+            found = []
+            for cx in range(x0, x1 + 1):
+                for cy in range(y0, y1 + 1):
+                    found.extend(self._cells.get((cx, cy), ()))
+            return found
+
+    def congested_cells(self, threshold):
+        # [(cell origin x, y in mm, robots holding reservations there)] above the threshold, busiest first
+        size = self.congestion_cell_size
+        with self._lock:
+            hot = [(cx * size, cy * size, count) for (cx, cy), count in self._reservations.items()
+                   if count > threshold]
+        return sorted(hot, key=lambda cell: -cell[2])
+
+    def stuck_robots(self, seconds, now):
+        with self._lock:
+            return [code for code, tracked in self._robots.items()
+                    if tracked.anchor is not None and now - tracked.since > seconds]
@@ -0,0 +1,24 @@
+import time
+
+class StartupTimer:
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.last = self.start
+        self.phases = []
+        self.reported = False
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.phases.append((phase, now - self.last))
+        self.last = now
+
+    def report(self, final_phase):
+        if self.reported:
+            return
+        self.mark(final_phase)
+        self.reported = True
+        total = (self.last - self.start) * 1000
+        steps = ", ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in self.phases)
+        print(f"⏱️ Startup {total:.0f} ms: {steps}")
+
+startup_timer = StartupTimer()
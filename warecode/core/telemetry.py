@@ -0,0 +1,138 @@
+import math, threading, time, warnings
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# (name, path into the projected ESS record); units as the ESS reports them (mV, mA, °C, %)
+CHANNELS = (
+    ("energy", ("energyLevel",)),
+    ("voltage", ("otherHardwareInfo", "batteryInfo", "voltage")),
+    ("current", ("otherHardwareInfo", "batteryInfo", "current")),
+    ("temperature", ("otherHardwareInfo", "batteryInfo", "temperature")),
+    ("soh", ("otherHardwareInfo", "batteryInfo", "soh")),
+    ("speed", ("otherHardwareInfo", "speed")),
+)
+CHANNEL_INDEX = {name: i for i, (name, _) in enumerate(CHANNELS)}
+
+def _number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+def _lookup(robot, path):
+    value = robot
+    for key in path:
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    if isinstance(value, dict):
+        # speed is reported as {"x", "y", "t"}; keep the linear magnitude
+        return math.hypot(_number(value.get("x")), _number(value.get("y")))
+    return value
+
+class TelemetryStore:
+    # Fixed-size ring of samples shared by the whole fleet: one row per robot, one column per sample,
+    # so every tick is a single vectorised column write. A sample is taken at most every `interval`
+    # seconds; robots missing from a sample hold NaN there.
+    def __init__(self, hours=4.0, interval=10.0, robots=256):
+        self.interval = interval
+        self.capacity = max(1, int(hours * 3600 / interval))
+        self._lock = threading.Lock()
+        self._slots = {}            # robot code -> row
+        self._codes = []            # row -> robot code
+        self._data = np.full((len(CHANNELS), robots, self.capacity), np.nan, dtype=np.float32)
+        self._times = np.full(self.capacity, np.nan)
+        self._cursor = 0            # column the next sample goes to
+        self._count = 0             # samples held (<= capacity)
+        self._last = -math.inf
+
+    @property
+    def nbytes(self):
+        return self._data.nbytes + self._times.nbytes
+
+    def _slot(self, code):
+        slot = self._slots.get(code)
+        if slot is None:
+            slot = self._slots[code] = len(self._codes)
+            self._codes.append(code)
+            if slot >= self._data.shape[1]:
+                # Only grows with the fleet itself, never with time
+                grown = np.full((len(CHANNELS), self._data.shape[1] * 2, self.capacity), np.nan, dtype=np.float32)
+                grown[:, :self._data.shape[1]] = self._data
+                self._data = grown
+        return slot
+
+    def append(self, robots, now=None):
+        now = time.time() if now is None else now
+        if now - self._last < self.interval:
+            return False
+        values = np.array([[_number(_lookup(robot, path)) for _, path in CHANNELS] for robot in robots],
+                          dtype=np.float32).reshape(len(robots), len(CHANNELS))
+        with self._lock:
+            slots = [self._slot(robot.get("code")) for robot in robots]
+            column = self._cursor
+            self._data[:, :, column] = np.nan
+            if slots:
+                self._data[:, slots, column] = values.T
+            self._times[column] = now
+            self._cursor = (column + 1) % self.capacity
+            self._count = min(self._count + 1, self.capacity)
+            self._last = now
+        return True
+
+    def _ordered(self, rows, channel):
+        # Oldest-to-newest copy of the ring for the given rows
+        start = (self._cursor - self._count) % self.capacity
+        order = (np.arange(self._count) + start) % self.capacity
+        return self._times[order], self._data[CHANNEL_INDEX[channel]][rows][..., order]
+
+    def series(self, code, channel, buckets=None, since=None):
+        # Returns (times, min, max, mean); with `buckets`, samples are averaged down to at most that many points
+        with self._lock:
+            slot = self._slots.get(code)
+            if slot is None:
+                empty = np.empty(0)
+                return empty, empty, empty, empty
+            times, values = self._ordered(slot, channel)
+        if since is not None:
+            keep = times >= since
+            times, values = times[keep], values[keep]
+        if not buckets or len(values) <= buckets:
+            return times, values, values, values
+        size = -(-len(values) // buckets)
+        pad = size * buckets - len(values)
+        values = np.concatenate((np.full(pad, np.nan, dtype=values.dtype), values)).reshape(buckets, size)
+        times = np.concatenate((np.full(pad, np.nan), times)).reshape(buckets, size)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)  # all-NaN buckets (robot offline) stay NaN
+            return (np.nanmax(times, axis=1), np.nanmin(values, axis=1), np.nanmax(values, axis=1),
+                    np.nanmean(values, axis=1))
+
+    def fleet_stats(self, channel, since=None):
+        # Per-robot (codes, min, max, mean, latest) over the window, e.g. to rank robots by voltage sag
+        with self._lock:
+            codes = list(self._codes)
+            times, values = self._ordered(slice(0, len(codes)), channel)
+        if since is not None:
+            values = values[:, times >= since]
+        if values.shape[1] == 0:
+            empty = np.full(len(codes), np.nan, dtype=np.float32)
+            return codes, empty, empty, empty, empty
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            return (codes, np.nanmin(values, axis=1), np.nanmax(values, axis=1), np.nanmean(values, axis=1),
+                    values[:, -1])
+
+_shared_store = None
+_shared_lock = threading.Lock()
+
+def get_telemetry_store():
+    # None when numpy isn't installed; the monitor then simply doesn't keep telemetry
+    global _shared_store
+    with _shared_lock:
+        if _shared_store is None and np is not None:
+            _shared_store = TelemetryStore()
+        return _shared_store
@@ -0,0 +1,61 @@
+import argparse, sys
+from core.simulator import SyntheticFleet, Recording, EssSimulator, record
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Local ESS stand-in and response recorder for load testing.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    serve = sub.add_parser("serve", help="serve ess-api/model/queryModelByType from a synthetic or recorded fleet")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=9000)
+    serve.add_argument("--replay", metavar="PATH", help="recording (.jsonl.gz) to replay instead of a synthetic fleet")
+    serve.add_argument("--speed", type=float, default=1.0, help="time multiplier, e.g. 10 replays a shift at 10x")
+    serve.add_argument("--robots", type=int, default=700)
+    serve.add_argument("--fault-rate", type=float, default=0.001, help="chance per robot per tick of a device fault")
+    serve.add_argument("--timeout-rate", type=float, default=0.0005, help="chance per robot per tick of a command timeout")
+    serve.add_argument("--recover-rate", type=float, default=0.05)
+    serve.add_argument("--bloat", type=int, default=1, help="multiplier for locked points / repeated error entries")
+    serve.add_argument("--seed", type=int)
+
+    rec = sub.add_parser("record", help="capture live ESS responses to a gzip JSON Lines file")
+    rec.add_argument("url", help="full query URL, e.g. http://10.251.3.24:9000/ess-api/model/queryModelByType?...")
+    rec.add_argument("out", help="output file (.jsonl.gz, appended to)")
+    rec.add_argument("--interval", type=float, default=1.0)
+    rec.add_argument("--duration", type=float, help="seconds to record (default: until Ctrl+C)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.command == "record":
+        from core.http_client import EssClient
+        client = EssClient(read_timeout=10.0)
+        print(f"⏺️ Recording {args.url} -> {args.out} (Ctrl+C to stop)", file=sys.stderr)
+        try:
+            frames = record(client, args.url, args.out, args.interval, args.duration)
+            print(f"✅ {frames} frames recorded", file=sys.stderr)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            client.close()
+        return
+
+    if args.replay:
+        source = Recording(args.replay)
+        label = f"{args.replay} ({len(source.frames)} frames, {source.duration:.0f}s)"
+    else:
+        source = SyntheticFleet(args.robots, args.fault_rate, args.timeout_rate, args.recover_rate,
+                                args.bloat, args.seed)
+        label = f"{args.robots} synthetic robots"
+    simulator = EssSimulator(source, args.host, args.port, speed=args.speed)
+    host, port = simulator.address
+    print(f"🤖 Serving {label} at {args.speed}x on http://{host}:{port}/ "
+          f"(monitor_daemon.py --endpoint SIM=http://{host}:{port}/)", file=sys.stderr)
+    try:
+        simulator.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        simulator.stop()
+
+if __name__ == "__main__":
+    main()
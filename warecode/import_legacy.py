@@ -0,0 +1,32 @@
+import argparse, sys
+from core.history import HistoryStore, HISTORY_FILE
+from core.legacy_import import import_file, CHUNK_SIZE
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Import legacy exception.txt logs into the history store.")
+    parser.add_argument("files", nargs="+", help="exception.txt style log files")
+    parser.add_argument("--history", default=HISTORY_FILE, help="SQLite history store path")
+    parser.add_argument("--workers", type=int, help="parser processes (default: one per core)")
+    parser.add_argument("--chunk-mb", type=float, default=CHUNK_SIZE / (1024 * 1024),
+                        help="size of the record-aligned chunks handed to each worker")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    history = HistoryStore(args.history)
+    chunk_size = max(1, int(args.chunk_mb * 1024 * 1024))
+    for path in args.files:
+        def progress(done, total):
+            print(f"\r⏳ {path}: {done * 100 // max(total, 1)}%", end="", file=sys.stderr)
+
+        try:
+            incidents, resolved, bad = import_file(history, path, args.workers, chunk_size, progress)
+        except OSError as e:
+            print(f"🚨 {path}: {e}", file=sys.stderr)
+            continue
+        print(f"\r✅ {path}: {incidents} incidents, {resolved} resolutions"
+              + (f", {bad} unreadable records skipped" if bad else ""), file=sys.stderr)
+    history.close()
+
+if __name__ == "__main__":
+    main()
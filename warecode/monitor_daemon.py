@@ -0,0 +1,75 @@
+import argparse, json, signal, sys
+from core.engine import MonitorEngine
+from core.history import HistoryStore, HISTORY_FILE
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Headless robot exception monitor (no GUI).")
+    parser.add_argument("--endpoint", action="append", metavar="NAME=URL",
+                        help="ESS to poll, e.g. ESS=http://10.251.3.24:9000/ (repeatable; "
+                             "defaults to resources/endpoints.json)")
+    parser.add_argument("--history", default=HISTORY_FILE, help="SQLite history store path")
+    parser.add_argument("--jsonl", metavar="PATH", help="also append incidents to this JSON Lines file")
+    parser.add_argument("--quiet", action="store_true", help="don't echo incidents to stdout")
+    parser.add_argument("--serve", metavar="[HOST:]PORT",
+                        help="publish fleet deltas and incidents to GUI clients (GUI_Script.py --server)")
+    return parser.parse_args(argv)
+
+def parse_endpoints(values):
+    if not values:
+        return None
+    endpoints = []
+    for value in values:
+        name, sep, url = value.partition("=")
+        if not sep:
+            name, url = f"ESS{len(endpoints) + 1}", value
+        endpoints.append({"name": name, "url": url})
+    return endpoints
+
+def main(argv=None):
+    args = parse_args(argv)
+    jsonl = open(args.jsonl, "a", encoding="utf-8") if args.jsonl else None
+
+    def write_incidents(events):
+        lines = "".join(json.dumps(event._asdict(), ensure_ascii=False) + "\n" for event in events)
+        if not args.quiet:
+            sys.stdout.write(lines)
+            sys.stdout.flush()
+        if jsonl is not None:
+            jsonl.write(lines)
+            jsonl.flush()
+
+    engine = MonitorEngine(history=HistoryStore(args.history), endpoints=parse_endpoints(args.endpoint),
+                           on_exceptions=write_incidents)
+
+    fanout = None
+    if args.serve:
+        from core.fanout import FanoutServer, parse_address
+        fanout = FanoutServer(engine, *parse_address(args.serve))
+        publish_exceptions = engine.on_exceptions
+
+        def on_exceptions(events):
+            write_incidents(events)
+            publish_exceptions(events)
+
+        engine.on_exceptions = on_exceptions
+        fanout.start()
+        print(f"📡 Serving GUI clients on {fanout.address[0]}:{fanout.address[1]}", file=sys.stderr)
+
+    def shutdown(signum, frame):
+        engine.stop()
+
+    signal.signal(signal.SIGINT, shutdown)
+    signal.signal(signal.SIGTERM, shutdown)
+
+    print(f"👀 Monitoring {', '.join(e.name for e in engine.poller.endpoints)} (Ctrl+C to stop)", file=sys.stderr)
+    try:
+        engine.run()
+    finally:
+        if fanout is not None:
+            fanout.stop()
+        engine.close()
+        if jsonl is not None:
+            jsonl.close()
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,11 @@
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QTableWidget, QTableWidgetItem, QPushButton, QHBoxLayout, QFileDialog, QMessageBox
-from core.blacklist import load_blacklist, save_blacklist
+from core.blacklist import get_blacklist_store
 
 class BlacklistTab(QWidget):
-    def __init__(self, parent=None):
+    def __init__(self, store=None, parent=None):
         super().__init__(parent)
-        self.ranges = load_blacklist()
+        self.store = store or get_blacklist_store()
+        self.ranges = list(self.store.snapshot.ranges)
         self.initUI()
 
     def initUI(self):
@@ -68,5 +69,6 @@ class BlacklistTab(QWidget):
                 return
 
         self.ranges = new_ranges
-        save_blacklist(self.ranges)
+        # Swaps the running monitor's index immediately, no restart needed
+        self.store.replace(self.ranges)
         QMessageBox.information(self, "Saved", "Blacklist updated successfully.")
@@ -0,0 +1,95 @@
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+PAGE_SIZE = 200
+PREVIEW_CHARS = 120
+
+class CompletedTableModel(QAbstractTableModel):
+    HEADERS = ["Robot ID", "Robot Type", "Error JSON", "Time of Exception", "Time Handled", "Error Type"]
+    # Positions in a HistoryStore.completed_page row
+    ID, ROBOT_ID, ROBOT_TYPE, PREVIEW, ERROR_LENGTH, TIME_OF_EXCEPTION, TIME_HANDLED, CATEGORY = range(8)
+    COLUMNS = (ROBOT_ID, ROBOT_TYPE, PREVIEW, TIME_OF_EXCEPTION, TIME_HANDLED, CATEGORY)
+    ERROR_COLUMN = 2
+
+    def __init__(self, history, parent=None):
+        super().__init__(parent)
+        self.history = history
+        self.filters = {}
+        self._rows = []
+        self._exhausted = False
+        self._full_text = {}  # incident id -> full error, filled on demand
+
+    def set_filters(self, robot_id=None, category=None, since=None, until=None):
+        self.beginResetModel()
+        self.filters = {"robot_id": robot_id, "category": category, "since": since, "until": until}
+        self._rows = []
+        self._exhausted = False
+        self._full_text.clear()
+        self.endResetModel()
+        # Load only the first page; the view pulls the rest as it scrolls
+        if self.canFetchMore(QModelIndex()):
+            self.fetchMore(QModelIndex())
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def canFetchMore(self, parent):
+        return not parent.isValid() and not self._exhausted
+
+    def fetchMore(self, parent):
+        if parent.isValid() or self._exhausted:
+            return
+        after = None
+        if self._rows:
+            last = self._rows[-1]
+            after = (last[self.TIME_HANDLED], last[self.ID])
+        page = self.history.completed_page(after=after, limit=PAGE_SIZE, preview=PREVIEW_CHARS, **self.filters)
+        if len(page) < PAGE_SIZE:
+            self._exhausted = True
+        if page:
+            first = len(self._rows)
+            self.beginInsertRows(QModelIndex(), first, first + len(page) - 1)
+            self._rows.extend(page)
+            self.endInsertRows()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self._rows[index.row()]
+        column = index.column()
+        if role == Qt.DisplayRole:
+            value = row[self.COLUMNS[column]]
+            if column == self.ERROR_COLUMN and (row[self.ERROR_LENGTH] or 0) > PREVIEW_CHARS:
+                return value + "…"
+            return value
+        if role == Qt.ToolTipRole and column == self.ERROR_COLUMN:
+            return self.full_error(index.row())
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def full_error(self, row):
+        record = self._rows[row]
+        if (record[self.ERROR_LENGTH] or 0) <= PREVIEW_CHARS:
+            return record[self.PREVIEW]
+        incident_id = record[self.ID]
+        if incident_id not in self._full_text:
+            self._full_text[incident_id] = self.history.error_text(incident_id)
+        return self._full_text[incident_id]
+
+    def load_new(self):
+        # New completions sort last; only show them once everything before is loaded
+        if not self._exhausted:
+            return
+        after = (self._rows[-1][self.TIME_HANDLED], self._rows[-1][self.ID]) if self._rows else None
+        page = self.history.completed_page(after=after, limit=PAGE_SIZE, preview=PREVIEW_CHARS, **self.filters)
+        if page:
+            first = len(self._rows)
+            self.beginInsertRows(QModelIndex(), first, first + len(page) - 1)
+            self._rows.extend(page)
+            self.endInsertRows()
@@ -0,0 +1,125 @@
+from itertools import count
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QEvent, QRect, pyqtSignal
+from PyQt5.QtWidgets import QStyledItemDelegate, QStyleOptionButton, QStyle, QApplication
+
+class Incident:
+    __slots__ = ("incident_id", "robot_id", "robot_type", "error", "time_of_exception", "time_handled", "category")
+
+    def __init__(self, incident_id, robot_id, robot_type, error, time_of_exception, time_handled, category):
+        self.incident_id = incident_id
+        self.robot_id = robot_id
+        self.robot_type = robot_type
+        self.error = error
+        self.time_of_exception = time_of_exception
+        self.time_handled = time_handled
+        self.category = category
+
+class ExceptionTableModel(QAbstractTableModel):
+    HEADERS = ["Robot ID", "Robot Type", "Error JSON", "Time of Exception", "Time Handled", "Error Type", "Action"]
+    FIELDS = ("robot_id", "robot_type", "error", "time_of_exception", "time_handled", "category")
+    ACTION_COLUMN = 6
+    HANDLED_COLUMN = 4
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []          # Incident
+        self._row_of = {}        # incident id -> row
+        self._unresolved = {}    # robot id -> incident ids still waiting for a Resolved event
+        self._ids = count(1)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        column = index.column()
+        if column == self.ACTION_COLUMN:
+            return "Mark Complete" if role == Qt.DisplayRole else None
+        if role in (Qt.DisplayRole, Qt.ToolTipRole):
+            return getattr(self._rows[index.row()], self.FIELDS[column])
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def incident(self, row):
+        return self._rows[row]
+
+    def add(self, robot_id, robot_type, error, time_of_exception, time_handled="N/A", category="Unknown"):
+        incident = Incident(next(self._ids), robot_id, robot_type, error, time_of_exception, time_handled, category)
+        row = len(self._rows)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._rows.append(incident)
+        self._row_of[incident.incident_id] = row
+        self._unresolved.setdefault(robot_id, []).append(incident.incident_id)
+        self.endInsertRows()
+        return incident
+
+    def resolve(self, robot_id, handled_time):
+        # Oldest unresolved incident for the robot gets the resolution time
+        pending = self._unresolved.get(robot_id)
+        if not pending:
+            return None
+        incident_id = pending.pop(0)
+        if not pending:
+            del self._unresolved[robot_id]
+        row = self._row_of.get(incident_id)
+        if row is None:
+            return None
+        incident = self._rows[row]
+        incident.time_handled = handled_time
+        index = self.index(row, self.HANDLED_COLUMN)
+        self.dataChanged.emit(index, index, [Qt.DisplayRole])
+        return incident
+
+    def take(self, row):
+        # Removes and returns the incident; the last row fills the hole so this stays O(1)
+        incident = self._rows[row]
+        del self._row_of[incident.incident_id]
+        pending = self._unresolved.get(incident.robot_id)
+        if pending and incident.incident_id in pending:
+            pending.remove(incident.incident_id)
+            if not pending:
+                del self._unresolved[incident.robot_id]
+
+        last = len(self._rows) - 1
+        if row != last:
+            moved = self._rows[last]
+            self._rows[row] = moved
+            self._row_of[moved.incident_id] = row
+            self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.HEADERS) - 1), [Qt.DisplayRole])
+        self.beginRemoveRows(QModelIndex(), last, last)
+        self._rows.pop()
+        self.endRemoveRows()
+        return incident
+
+    def take_incident(self, robot_id, time_of_exception):
+        # Drops the robot's incident that started at time_of_exception, if this console still lists it
+        for row, incident in enumerate(self._rows):
+            if incident.robot_id == robot_id and incident.time_of_exception == time_of_exception:
+                return self.take(row)
+        return None
+
+class ButtonDelegate(QStyledItemDelegate):
+    # Paints a push button instead of creating a QPushButton widget per row
+    clicked = pyqtSignal(QModelIndex)
+
+    def paint(self, painter, option, index):
+        button = QStyleOptionButton()
+        button.rect = QRect(option.rect.adjusted(2, 2, -2, -2))
+        button.text = index.data(Qt.DisplayRole) or ""
+        button.state = QStyle.State_Enabled | QStyle.State_Raised
+        QApplication.style().drawControl(QStyle.CE_PushButton, button, painter)
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton \
+                and option.rect.contains(event.pos()):
+            self.clicked.emit(index)
+            return True
+        return super().editorEvent(event, model, option, index)
@@ -1,49 +1,107 @@
-from PyQt5.QtWidgets import QMainWindow, QTabWidget, QWidget, QVBoxLayout, QTableWidget, QTableWidgetItem, QPushButton, QMessageBox, QMessageBox
-from core.monitor_thread import RobotMonitorThread
-from ui.blacklist_tab import BlacklistTab
-from core.session import save_session, load_session, clear_session
+from PyQt5.QtWidgets import QMainWindow, QTabWidget, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QMessageBox, QTableView, QLineEdit, QComboBox, QAbstractItemView, QProgressBar, QFileDialog
+from PyQt5.QtCore import Qt, QTimer, QSortFilterProxyModel
+from PyQt5.QtWidgets import QApplication
+from ui.robot_table_model import RobotTableModel, RobotFilterProxyModel
+from ui.exception_model import ExceptionTableModel, ButtonDelegate
+from core.session import SessionJournal, compact_session, clear_session
+from core.history import get_history_store
+from core.blacklist import get_blacklist_store
+from core.startup import startup_timer
 import time
 
 class RobotMonitorApp(QMainWindow):
-    def __init__(self, session):
+    def __init__(self, session, server=None):
         super().__init__()
         self.session = session
+        self.server = server  # (host, port) of a shared fan-out server, or None to poll the ESS directly
+        self.journal = SessionJournal()
         self.setWindowTitle("Robot Monitoring System")
         self.setGeometry(100, 100, 900, 600)
 
-        # Build UI first (creates self.completed_table)
+        self.history = get_history_store()
+        self.monitor_thread = None
+        self.completed_model = None
+        self.report_thread = None
+
+        # Exception batches are coalesced and applied at most once per display frame
+        self._pending_exceptions = []
+        self._exception_flush_timer = QTimer(self)
+        self._exception_flush_timer.setSingleShot(True)
+        screen = QApplication.primaryScreen()
+        refresh_rate = screen.refreshRate() if screen is not None else 0
+        self._exception_flush_timer.setInterval(int(1000 / refresh_rate) if refresh_rate > 0 else 16)
+        self._exception_flush_timer.timeout.connect(self.flush_exceptions)
+
         self.initUI()
+        startup_timer.mark("build window")
 
-        # Now it's safe to populate Completed tab
-        self.populate_completed_from_json(session.get("completed_exceptions", []))
+        # Start polling once the window has painted; the monitor pulls in requests/asyncio
+        QTimer.singleShot(0, self.start_monitoring)
 
-        # Start monitoring thread
-        self.monitor_thread = RobotMonitorThread()
+    def start_monitoring(self):
+        startup_timer.mark("first paint")
+        if self.server is not None:
+            from core.monitor_thread import RemoteMonitorThread
+            self.monitor_thread = RemoteMonitorThread(*self.server, history=self.history,
+                                                      blacklist_store=get_blacklist_store())
+        else:
+            from core.monitor_thread import RobotMonitorThread
+            self.monitor_thread = RobotMonitorThread(history=self.history, blacklist_store=get_blacklist_store())
         self.monitor_thread.update_signal.connect(self.update_monitoring_tab)
-        self.monitor_thread.error_signal.connect(self.add_exception)
+        self.monitor_thread.exceptions_signal.connect(self.queue_exceptions)
         self.monitor_thread.start()
+        startup_timer.report("start monitor")
 
     def initUI(self):
         self.tabs = QTabWidget()
         self.monitoring_tab = self.create_monitoring_tab()
         self.exception_handling_tab = self.create_exception_handling_tab()
-        self.completed_tab = self.create_completed_tab()
-        self.workflow_tab = self.create_workflow_tab()
-        self.blacklist_tab = BlacklistTab()
         self.tabs.addTab(self.monitoring_tab, "Monitoring")
         self.tabs.addTab(self.exception_handling_tab, "Exception Handling")
-        self.tabs.addTab(self.completed_tab, "Completed Exceptions")
-        self.tabs.addTab(self.blacklist_tab, "Blacklist")
-        self.tabs.addTab(self.workflow_tab, "Workflow")
+
+        # The remaining tabs are built the first time they are opened
+        self._deferred_tabs = {}
+        for title, builder in (("Completed Exceptions", self.create_completed_tab),
+                               ("Blacklist", self.create_blacklist_tab),
+                               ("Workflow", self.create_workflow_tab)):
+            placeholder = QWidget()
+            placeholder_layout = QVBoxLayout()
+            placeholder_layout.setContentsMargins(0, 0, 0, 0)
+            placeholder.setLayout(placeholder_layout)
+            index = self.tabs.addTab(placeholder, title)
+            self._deferred_tabs[index] = builder
+        self.tabs.currentChanged.connect(self.ensure_tab)
         self.setCentralWidget(self.tabs)
 
+    def ensure_tab(self, index):
+        builder = self._deferred_tabs.pop(index, None)
+        if builder is not None:
+            self.tabs.widget(index).layout().addWidget(builder())
+
+    def create_blacklist_tab(self):
+        from ui.blacklist_tab import BlacklistTab
+        self.blacklist_tab = BlacklistTab(store=get_blacklist_store())
+        return self.blacklist_tab
+
     def create_monitoring_tab(self):
         tab = QWidget()
         layout = QVBoxLayout()
 
-        self.robot_table = QTableWidget()
-        self.robot_table.setColumnCount(3)
-        self.robot_table.setHorizontalHeaderLabels(["Robot ID", "Robot Type", "State"])
+        self.robot_filter = QLineEdit()
+        self.robot_filter.setPlaceholderText("Filter robots...")
+        layout.addWidget(self.robot_filter)
+
+        self.robot_model = RobotTableModel(self)
+        self.robot_proxy = RobotFilterProxyModel(self)
+        self.robot_proxy.setSourceModel(self.robot_model)
+        self.robot_filter.textChanged.connect(self.robot_proxy.setFilterFixedString)
+
+        self.robot_table = QTableView()
+        self.robot_table.setModel(self.robot_proxy)
+        self.robot_table.setSortingEnabled(True)
+        self.robot_table.sortByColumn(0, Qt.AscendingOrder)
+        self.robot_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.robot_table.setSelectionBehavior(QAbstractItemView.SelectRows)
         layout.addWidget(self.robot_table)
         tab.setLayout(layout)
         return tab
@@ -52,74 +110,71 @@ class RobotMonitorApp(QMainWindow):
         tab = QWidget()
         layout = QVBoxLayout()
 
-        self.exception_table = QTableWidget()
-        self.exception_table.setColumnCount(7)
-        self.exception_table.setColumnCount(7)
-        self.exception_table.setHorizontalHeaderLabels(
-            ["Robot ID", "Robot Type", "Error JSON", "Time of Exception", "Time Handled", "Error Type", "Action"]
-        )
+        self.exception_model = ExceptionTableModel(self)
+        self.exception_proxy = QSortFilterProxyModel(self)
+        self.exception_proxy.setSourceModel(self.exception_model)
+
+        self.exception_table = QTableView()
+        self.exception_table.setModel(self.exception_proxy)
+        self.exception_table.setSortingEnabled(True)
+        self.exception_table.sortByColumn(3, Qt.AscendingOrder)
+        self.exception_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.exception_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+
+        self.mark_complete_delegate = ButtonDelegate(self.exception_table)
+        self.mark_complete_delegate.clicked.connect(self.mark_as_done)
+        self.exception_table.setItemDelegateForColumn(ExceptionTableModel.ACTION_COLUMN,
+                                                      self.mark_complete_delegate)
 
         layout.addWidget(self.exception_table)
         tab.setLayout(layout)
         return tab
 
-    def update_monitoring_tab(self, robot_data):
-        self.robot_table.setRowCount(0)
-        for row_index, (robot_id, robot_type, state) in enumerate(robot_data):
-            self.robot_table.insertRow(row_index)
-            self.robot_table.setItem(row_index, 0, QTableWidgetItem(robot_id))
-            self.robot_table.setItem(row_index, 1, QTableWidgetItem(robot_type))
-            self.robot_table.setItem(row_index, 2, QTableWidgetItem(state))
+    def update_monitoring_tab(self, delta):
+        self.robot_model.apply_delta(delta)
+
+    def queue_exceptions(self, events):
+        self._pending_exceptions.extend(events)
+        if not self._exception_flush_timer.isActive():
+            self._exception_flush_timer.start()
+
+    def flush_exceptions(self):
+        events, self._pending_exceptions = self._pending_exceptions, []
+        if not events:
+            return
+        self.exception_table.setUpdatesEnabled(False)
+        try:
+            for event in events:
+                self.add_exception(*event)
+        finally:
+            self.exception_table.setUpdatesEnabled(True)
 
     def add_exception(self, robot_id, robot_type, error_json, exception_time, handled_time="N/A", category="Unknown"):
         if error_json == "Resolved":
             self.update_exception_handled(robot_id, handled_time)
+        elif error_json == "Handled":
+            # Another console marked it complete
+            self.exception_model.take_incident(robot_id, exception_time)
         else:
-            row_position = self.exception_table.rowCount()
-            self.exception_table.insertRow(row_position)
-            self.exception_table.setItem(row_position, 0, QTableWidgetItem(robot_id))
-            self.exception_table.setItem(row_position, 1, QTableWidgetItem(robot_type))
-            self.exception_table.setItem(row_position, 2, QTableWidgetItem(error_json))
-            self.exception_table.setItem(row_position, 3, QTableWidgetItem(exception_time))
-            self.exception_table.setItem(row_position, 4, QTableWidgetItem(handled_time))
-            self.exception_table.setItem(row_position, 5, QTableWidgetItem(category))
-
-            mark_complete_button = QPushButton("Mark Complete")
-            mark_complete_button.clicked.connect(lambda _, btn=mark_complete_button: self.mark_as_done(btn))
-            self.exception_table.setCellWidget(row_position, 6, mark_complete_button)
+            self.exception_model.add(robot_id, robot_type, error_json, exception_time, handled_time, category)
 
     def update_exception_handled(self, robot_id, handled_time):
-        for row in range(self.exception_table.rowCount()):
-            if self.exception_table.item(row, 0).text() == robot_id:
-                self.exception_table.setItem(row, 4, QTableWidgetItem(handled_time))
-                return
-
-    def mark_as_done(self, button):
-        index = self.exception_table.indexAt(button.pos())
-        row = index.row()
+        self.exception_model.resolve(robot_id, handled_time)
+
+    def mark_as_done(self, index):
+        source_index = self.exception_proxy.mapToSource(index)
+        row = source_index.row()
         if row >= 0:
-            robot_id = self.exception_table.item(row, 0).text()
-            robot_type = self.exception_table.item(row, 1).text()
-            error_json = self.exception_table.item(row, 2).text()
-            exception_time = self.exception_table.item(row, 3).text()
+            incident = self.exception_model.take(row)
+            robot_id = incident.robot_id
+            robot_type = incident.robot_type
+            error_json = incident.error
+            exception_time = incident.time_of_exception
             handled_time = time.strftime("%Y-%m-%d %H:%M:%S")
-            category = self.exception_table.item(row, 5).text()
+            category = incident.category
 
             # Tell the thread this robot is handled
-            self.monitor_thread.mark_robot_handled(robot_id)
-
-            # Move to Completed tab
-            completed_row = self.completed_table.rowCount()
-            self.completed_table.insertRow(completed_row)
-            self.completed_table.setItem(completed_row, 0, QTableWidgetItem(robot_id))
-            self.completed_table.setItem(completed_row, 1, QTableWidgetItem(robot_type))
-            self.completed_table.setItem(completed_row, 2, QTableWidgetItem(error_json))
-            self.completed_table.setItem(completed_row, 3, QTableWidgetItem(exception_time))
-            self.completed_table.setItem(completed_row, 4, QTableWidgetItem(handled_time))
-            self.completed_table.setItem(completed_row, 5, QTableWidgetItem(category))
-
-            # Remove from active table
-            self.exception_table.removeRow(row)
+            self.monitor_thread.mark_robot_handled(robot_id, exception_time)
 
             # Append to JSON
             record = {
@@ -132,25 +187,89 @@ class RobotMonitorApp(QMainWindow):
                 "employee": self.session["employee"]
             }
             self.session["completed_exceptions"].append(record)
-            save_session(self.session)
+            self.journal.append(record)
+            self.history.complete(robot_id, robot_type, category, error_json, exception_time,
+                                  handled_time, self.session["employee"])
+
+            # Move to Completed tab (if it has been opened yet)
+            if self.completed_model is not None:
+                self.completed_model.load_new()
 
     def create_workflow_tab(self):
         tab = QWidget()
         layout = QVBoxLayout()
 
+        report_layout = QHBoxLayout()
+        self.report_since = QLineEdit(self.session.get("start_time", ""))
+        self.report_since.setPlaceholderText("From (YYYY-MM-DD HH:MM:SS)")
+        self.report_until = QLineEdit()
+        self.report_until.setPlaceholderText("To (YYYY-MM-DD HH:MM:SS)")
+        self.report_btn = QPushButton("Export Report...")
+        self.report_btn.clicked.connect(self.export_report)
+        self.report_cancel_btn = QPushButton("Cancel")
+        self.report_cancel_btn.setEnabled(False)
+        self.report_cancel_btn.clicked.connect(self.cancel_report)
+        for widget in (self.report_since, self.report_until, self.report_btn, self.report_cancel_btn):
+            report_layout.addWidget(widget)
+        layout.addLayout(report_layout)
+        self.report_progress = QProgressBar()
+        self.report_progress.setVisible(False)
+        layout.addWidget(self.report_progress)
+
         logout_btn = QPushButton("End Session (Logout)")
         logout_btn.clicked.connect(self.end_session)
 
         layout.addWidget(logout_btn)
+        layout.addStretch()
         tab.setLayout(layout)
         return tab
 
+    def export_report(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Export Report", "exception_report.xlsx",
+                                              "Excel Workbook (*.xlsx);;CSV (*.csv)")
+        if not path:
+            return
+        # Runs on its own thread; the history store gives it a separate SQLite connection
+        from core.report_thread import ReportThread
+        self.report_thread = ReportThread(self.history, path, self.report_since.text().strip() or None,
+                                          self.report_until.text().strip() or None)
+        self.report_thread.progress_signal.connect(self.update_report_progress)
+        self.report_thread.done_signal.connect(self.report_done)
+        self.report_thread.failed_signal.connect(self.report_failed)
+        self.report_thread.finished.connect(self.report_finished)
+        self.report_btn.setEnabled(False)
+        self.report_cancel_btn.setEnabled(True)
+        self.report_progress.setRange(0, 0)
+        self.report_progress.setVisible(True)
+        self.report_thread.start()
+
+    def cancel_report(self):
+        if self.report_thread is not None:
+            self.report_thread.cancel()
+
+    def update_report_progress(self, done, total):
+        self.report_progress.setRange(0, max(total, 1))
+        self.report_progress.setValue(done)
+
+    def report_done(self, paths, rows):
+        QMessageBox.information(self, "Report Exported", f"{rows} exceptions exported to:\n" + "\n".join(paths))
+
+    def report_failed(self, message):
+        QMessageBox.warning(self, "Report Export", message)
+
+    def report_finished(self):
+        self.report_btn.setEnabled(True)
+        self.report_cancel_btn.setEnabled(False)
+        self.report_progress.setVisible(False)
+        self.report_thread = None
+
     def end_session(self):
         confirm = QMessageBox.question(
             self, "End Session", "End session and clear data?",
             QMessageBox.Yes | QMessageBox.No
         )
         if confirm == QMessageBox.Yes:
+            self.journal.close()
             clear_session()
             QMessageBox.information(self, "Session Ended", "Session cleared for next shift.")
             self.close()
@@ -159,27 +278,59 @@ class RobotMonitorApp(QMainWindow):
         tab = QWidget()
         layout = QVBoxLayout()
 
-        self.completed_table = QTableWidget()
-        self.completed_table.setColumnCount(6)
-        self.completed_table.setHorizontalHeaderLabels(
-            ["Robot ID", "Robot Type", "Error JSON", "Time of Exception", "Time Handled", "Error Type"]
-        )
+        filter_layout = QHBoxLayout()
+        self.completed_robot_filter = QLineEdit()
+        self.completed_robot_filter.setPlaceholderText("Robot ID")
+        self.completed_category_filter = QComboBox()
+        self.completed_category_filter.addItem("")
+        self.completed_category_filter.addItems(self.history.categories())
+        self.completed_since_filter = QLineEdit(self.session.get("start_time", ""))
+        self.completed_since_filter.setPlaceholderText("From (YYYY-MM-DD HH:MM:SS)")
+        self.completed_until_filter = QLineEdit()
+        self.completed_until_filter.setPlaceholderText("To (YYYY-MM-DD HH:MM:SS)")
+        apply_btn = QPushButton("Apply Filter")
+        apply_btn.clicked.connect(self.apply_completed_filters)
+        self.completed_robot_filter.returnPressed.connect(self.apply_completed_filters)
+        for widget in (self.completed_robot_filter, self.completed_category_filter,
+                       self.completed_since_filter, self.completed_until_filter, apply_btn):
+            filter_layout.addWidget(widget)
+        layout.addLayout(filter_layout)
+
+        # Rows are paged in from the history store as the view scrolls
+        from ui.completed_model import CompletedTableModel
+        self.completed_model = CompletedTableModel(self.history, self)
+        self.completed_table = QTableView()
+        self.completed_table.setModel(self.completed_model)
+        self.completed_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.completed_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.completed_table.doubleClicked.connect(self.show_completed_error)
 
         layout.addWidget(self.completed_table)
         tab.setLayout(layout)
+
+        # Completed tab shows this shift by default
+        self.apply_completed_filters()
         return tab
 
-    def populate_completed_from_json(self, data):
-        self.completed_table.setRowCount(0)
-        for record in data:
-            row = self.completed_table.rowCount()
-            self.completed_table.insertRow(row)
-            self.completed_table.setItem(row, 0, QTableWidgetItem(record["robot_id"]))
-            self.completed_table.setItem(row, 1, QTableWidgetItem(record["robot_type"]))
-            self.completed_table.setItem(row, 2, QTableWidgetItem(record["error"]))
-            self.completed_table.setItem(row, 3, QTableWidgetItem(record["time_of_exception"]))
-            self.completed_table.setItem(row, 4, QTableWidgetItem(record["time_handled"]))
-            self.completed_table.setItem(row, 5, QTableWidgetItem(record["category"]))
+    def apply_completed_filters(self):
+        self.completed_model.set_filters(
+            robot_id=self.completed_robot_filter.text().strip() or None,
+            category=self.completed_category_filter.currentText() or None,
+            since=self.completed_since_filter.text().strip() or None,
+            until=self.completed_until_filter.text().strip() or None,
+        )
+
+    def show_completed_error(self, index):
+        if index.column() == self.completed_model.ERROR_COLUMN:
+            QMessageBox.information(self, "Error JSON", self.completed_model.full_error(index.row()))
+
     def closeEvent(self, event):
-        self.monitor_thread.stop()
+        if self.monitor_thread is not None:
+            self.monitor_thread.stop()
+        if self.report_thread is not None:
+            self.report_thread.cancel()
+            self.report_thread.wait()
+        if not self.journal.closed:
+            self.journal.close()
+            compact_session(self.session)
         event.accept()
\ No newline at end of file
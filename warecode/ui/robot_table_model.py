@@ -0,0 +1,78 @@
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QSortFilterProxyModel
+
+class RobotTableModel(QAbstractTableModel):
+    HEADERS = ["Robot ID", "Robot Type", "State", "Source"]
+    COLUMNS = (
+        lambda robot: robot.code,
+        lambda robot: robot.display_type,
+        lambda robot: robot.hardware_state,
+        lambda robot: f"{robot.source} (stale)" if robot.stale else robot.source,
+    )
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []   # RobotSnapshot, shared with the monitor thread (never mutated)
+        self._index = {}  # robot id -> row
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.DisplayRole:
+            return self.COLUMNS[index.column()](self._rows[index.row()])
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def apply_delta(self, delta):
+        if delta.removed:
+            self._remove(delta.removed)
+
+        if delta.added:
+            new_rows = [robot for robot in delta.added if robot.code not in self._index]
+            if new_rows:
+                first = len(self._rows)
+                self.beginInsertRows(QModelIndex(), first, first + len(new_rows) - 1)
+                for robot in new_rows:
+                    self._index[robot.code] = len(self._rows)
+                    self._rows.append(robot)
+                self.endInsertRows()
+
+        for robot in delta.changed:
+            row = self._index.get(robot.code)
+            if row is None:
+                continue
+            current = self._rows[row]
+            self._rows[row] = robot
+            changed = [column for column in range(1, len(self.COLUMNS))
+                       if self.COLUMNS[column](current) != self.COLUMNS[column](robot)]
+            if changed:
+                self.dataChanged.emit(self.index(row, changed[0]), self.index(row, changed[-1]), [Qt.DisplayRole])
+
+    def _remove(self, robot_ids):
+        # Highest row first, so the rows still to be removed keep their positions
+        rows = sorted((self._index.pop(robot_id) for robot_id in robot_ids if robot_id in self._index),
+                      reverse=True)
+        if not rows:
+            return
+        for row in rows:
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self._rows[row]
+            self.endRemoveRows()
+        for row in range(rows[-1], len(self._rows)):
+            self._index[self._rows[row].code] = row
+
+class RobotFilterProxyModel(QSortFilterProxyModel):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setFilterCaseSensitivity(Qt.CaseInsensitive)
+        self.setFilterKeyColumn(-1)
+        self.setDynamicSortFilter(True)